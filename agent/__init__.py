@@ -6,4 +6,30 @@ This package contains the main components of the project:
 3. executor.py: Web search execution
 
 This package is designed in a modular way for easy development and maintenance.
-"""
\ No newline at end of file
+Public names are imported lazily on first access so that `import agent`
+stays cheap.
+"""
+
+import importlib
+
+__all__ = ["AIFactory", "WebExecutor", "analyze_user_request"]
+
+# Public name -> submodule that defines it
+_LAZY_ATTRS = {
+    "AIFactory": ".ai.factory",
+    "WebExecutor": ".executor",
+    "analyze_user_request": ".planner",
+}
+
+
+def __getattr__(name):
+    module_name = _LAZY_ATTRS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
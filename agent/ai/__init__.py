@@ -0,0 +1,31 @@
+"""
+AI provider clients and the factory that selects between them.
+
+Public names are resolved lazily on first attribute access (PEP 562), so
+importing this package does not load any provider SDK.
+"""
+
+import importlib
+
+__all__ = ["AIFactory", "GeminiClient", "OpenAIClient", "MockClient"]
+
+# Public name -> submodule that defines it
+_LAZY_ATTRS = {
+    "AIFactory": ".factory",
+    "GeminiClient": ".gemini_client",
+    "OpenAIClient": ".openai_client",
+    "MockClient": ".mock_client",
+}
+
+
+def __getattr__(name):
+    module_name = _LAZY_ATTRS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
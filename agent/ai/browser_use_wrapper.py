@@ -4,20 +4,46 @@ Simple wrapper to run browser-use (or other commands) inside an isolated virtual
 Usage pattern:
 - Create virtualenv (see README update) and install packages from requirements-browser.txt
 - Call run_in_venv([...]) to execute a command using that venv's python
+- From async code, await run_in_venv_async([...]) so the event loop stays free
 
 This wrapper intentionally keeps runtime invocation simple and returns stdout/stderr.
 """
 from __future__ import annotations
+import asyncio
 import subprocess
 import sys
 from pathlib import Path
-from typing import Tuple, List, Optional
+from typing import Dict, Tuple, List, Optional
 
 DEFAULT_VENV = Path('.venv-browser')
 
 
+# Resolved venv directory -> python executable found inside it
+_PYEXE_CACHE: Dict[Path, Path] = {}
+
+
 def _python_executable(venv_path: Path) -> Optional[Path]:
-    """Return the python executable path for the venv (Windows & Unix) if present."""
+    """Return the python executable path for the venv (Windows & Unix) if present.
+
+    Successful lookups are cached per venv; a venv that is missing is
+    checked again on the next call.
+    """
+    key = venv_path.resolve()
+    cached = _PYEXE_CACHE.get(key)
+    if cached is not None:
+        return cached
+    python = _find_python_executable(key)
+    if python is not None:
+        _PYEXE_CACHE[key] = python
+    return python
+
+
+def _forget_python_executable(venv_path: Path) -> None:
+    """Drop a cached executable, e.g. after the venv was deleted."""
+    _PYEXE_CACHE.pop(venv_path.resolve(), None)
+
+
+def _find_python_executable(venv_path: Path) -> Optional[Path]:
     if not venv_path.exists():
         return None
     # Windows
@@ -50,10 +76,46 @@ def run_in_venv(args: List[str], venv_path: str | Path = DEFAULT_VENV, timeout:
     try:
         proc = subprocess.run(cmd, capture_output=True, text=True, timeout=timeout)
         return proc.returncode, proc.stdout, proc.stderr
+    except FileNotFoundError:
+        _forget_python_executable(venv)
+        raise
     except subprocess.TimeoutExpired as e:
         return -1, '', f'Timeout after {timeout}s: {e}'
 
 
+async def run_in_venv_async(args: List[str], venv_path: str | Path = DEFAULT_VENV, timeout: int = 300) -> Tuple[int, str, str]:
+    """Async variant of run_in_venv. Returns (returncode, stdout, stderr).
+
+    The child runs via asyncio subprocesses, so other coroutines keep running
+    while it works. Output is decoded as UTF-8 with invalid bytes replaced.
+    """
+    venv = Path(venv_path)
+    python = _python_executable(venv)
+    if python is None:
+        raise FileNotFoundError(f"Python executable not found in venv '{venv}'")
+
+    try:
+        proc = await asyncio.create_subprocess_exec(
+            str(python), *args,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+    except FileNotFoundError:
+        _forget_python_executable(venv)
+        raise
+    try:
+        out, err = await asyncio.wait_for(proc.communicate(), timeout=timeout)
+    except asyncio.TimeoutError as e:
+        proc.kill()
+        await proc.wait()
+        return -1, '', f'Timeout after {timeout}s: {e}'
+    return (
+        proc.returncode if proc.returncode is not None else -1,
+        out.decode('utf-8', errors='replace'),
+        err.decode('utf-8', errors='replace'),
+    )
+
+
 if __name__ == '__main__':
     import argparse
     parser = argparse.ArgumentParser(description='Run a command inside .venv-browser')
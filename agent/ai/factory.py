@@ -7,21 +7,50 @@ available.
 """
 
 import os
+import types
+import logging
+import functools
+import threading
 from typing import Optional
 
 
+@functools.lru_cache(maxsize=1)
+def _google_key() -> Optional[str]:
+    """Return GOOGLE_API_KEY, read from the environment once per process."""
+    return os.getenv('GOOGLE_API_KEY')
+
+
+@functools.lru_cache(maxsize=1)
+def _openai_key() -> Optional[str]:
+    """Return OPENAI_API_KEY, read from the environment once per process."""
+    return os.getenv('OPENAI_API_KEY')
+
+
+# Clients already built by create_client, keyed by (provider, model).
+# create_client may run on worker threads, so access goes through the lock.
+_CLIENT_CACHE: dict[tuple[Optional[str], Optional[str]], object] = {}
+_CLIENT_CACHE_LOCK = threading.Lock()
+
+
+def _invalidate_env_cache() -> None:
+    """Forget cached API keys (e.g. after loading a .env file or in tests)."""
+    _google_key.cache_clear()
+    _openai_key.cache_clear()
+
+
 class AIFactory:
     """Factory class to create appropriate AI client based on configuration"""
 
-    # Available models by provider
-    MODELS = {
-        'gemini': [
-            'gemini-2.5-flash'
-        ],
-        'openai': [
-            'gpt-oss-120b'
-        ],
-    }
+    # Available models by provider (read-only)
+    MODELS = types.MappingProxyType({
+        'gemini': (
+            'gemini-2.5-flash',
+        ),
+        'openai': (
+            'gpt-oss-120b',
+        ),
+    })
+    _DEFAULT_MODELS = ('mock-model',)
 
     @staticmethod
     def get_available_providers():
@@ -29,10 +58,12 @@ class AIFactory:
         from utils.logger import logger
         providers = []
         
-        google_key = os.getenv('GOOGLE_API_KEY')
-        openai_key = os.getenv('OPENAI_API_KEY')
+        google_key = _google_key()
+        openai_key = _openai_key()
         
-        logger.info(f"Checking API Keys - Google: {'Available' if google_key else 'Not found'}, OpenAI: {'Available' if openai_key else 'Not found'}")
+        logger.info("Checking API Keys - Google: %s, OpenAI: %s",
+                    'Available' if google_key else 'Not found',
+                    'Available' if openai_key else 'Not found')
         
         if google_key:
             logger.info("Adding Google Gemini provider")
@@ -44,13 +75,37 @@ class AIFactory:
             logger.warning("No API keys found, falling back to mock provider")
             providers.append(('Local Test', 'mock'))
         
-        logger.info(f"Available providers: {[p[0] for p in providers]}")
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Available providers: %s", [p[0] for p in providers])
         return providers
 
     @staticmethod
-    def get_models(provider: str) -> list:
+    def get_models(provider: str) -> tuple:
         """Get available models for a provider"""
-        return AIFactory.MODELS.get(provider, ['mock-model'])
+        return AIFactory.MODELS.get(provider, AIFactory._DEFAULT_MODELS)
+
+    @staticmethod
+    def cached_clients() -> list:
+        """Return the memoized clients (e.g. to close them at shutdown)"""
+        with _CLIENT_CACHE_LOCK:
+            return list(_CLIENT_CACHE.values())
+
+    @staticmethod
+    def is_cached(provider: Optional[str], model: Optional[str]) -> bool:
+        """Whether create_client(provider, model) returns a memoized client
+
+        False after a fallback: the next call tries the provider again.
+        """
+        if provider is not None:
+            provider = provider.lower()
+        with _CLIENT_CACHE_LOCK:
+            return (provider, model) in _CLIENT_CACHE
+
+    @staticmethod
+    def clear_cache() -> None:
+        """Drop all memoized clients so the next create_client builds fresh ones"""
+        with _CLIENT_CACHE_LOCK:
+            _CLIENT_CACHE.clear()
 
     @staticmethod
     def create_client(provider: Optional[str] = None, model: Optional[str] = None):
@@ -61,42 +116,92 @@ class AIFactory:
             model: Optional model name (passed to client if supported)
 
         Returns:
-            An instance of a client class (GeminiClient, OpenAIClient or MockClient)
+            An instance of a client class (GeminiClient, OpenAIClient or MockClient).
+            Clients are memoized per (provider, model), so repeated calls return
+            the same instance without re-running SDK setup. The MockClient
+            returned when the providers failed is not memoized, so a later
+            call (e.g. once a key is set) tries them again.
         """
         # If provider explicitly requested, normalize
         if provider is not None:
             provider = provider.lower()
 
-        # Try Google Gemini first if requested or if GOOGLE_API_KEY present
-        if provider == 'gemini' or (provider is None and os.getenv('GOOGLE_API_KEY')):
-            try:
-                from .gemini_client import GeminiClient
-                return GeminiClient(model)
-            except Exception:
-                # Fallthrough to try OpenAI or Mock
-                pass
+        key = (provider, model)
+        with _CLIENT_CACHE_LOCK:
+            cached = _CLIENT_CACHE.get(key)
+        if cached is not None:
+            return cached
+        client, fallback = AIFactory._build_client(provider, model)
+        if fallback:
+            return client
+        with _CLIENT_CACHE_LOCK:
+            # Another thread may have built one meanwhile; keep the first
+            return _CLIENT_CACHE.setdefault(key, client)
+
+    @staticmethod
+    def _build_client(provider: Optional[str], model: Optional[str]):
+        """Construct a new client for create_client (no caching).
+
+        Providers are tried in order: the explicitly requested one, or those
+        with an API key set (Gemini first), and finally the mock client.
+        Returns (client, fallback), where fallback is true if the mock client
+        stands in for a provider that was requested or expected (by key) but
+        could not be built, or for missing API keys.
+        """
+        from utils.logger import logger
+        if provider is None:
+            candidates = [name for name, key in (('gemini', _google_key), ('openai', _openai_key)) if key()]
+        elif provider in ('gemini', 'openai'):
+            candidates = [provider]
+        else:
+            candidates = []
 
-        # Try OpenAI next
-        if provider == 'openai' or (provider is None and os.getenv('OPENAI_API_KEY')):
+        for name in candidates:
             try:
-                from .openai_client import OpenAIClient
-                # OpenAIClient expects no positional arguments; create instance first
-                client = OpenAIClient()
-                # If a model was provided, try to configure the client with it.
-                # Prefer a setter method if available, otherwise fall back to setting an attribute.
-                if model is not None:
-                    setter = getattr(client, 'set_model', None)
-                    if callable(setter):
-                        setter(model)
-                    else:
-                        setattr(client, 'model', model)
-                return client
+                return _BUILDERS[name](model), False
+            except ImportError as e:
+                logger.warning("%s client unavailable (missing dependency: %s)", name, e)
             except Exception:
+                # Fall through to the next provider or Mock
                 pass
 
         # Last resort: return MockClient for local testing
         try:
-            from .mock_client import MockClient
-            return MockClient()
+            # Intended only for a provider other than gemini/openai
+            return _BUILDERS['mock'](model), provider is None or bool(candidates)
         except Exception:
-            raise RuntimeError('No AI client available')
\ No newline at end of file
+            raise RuntimeError('No AI client available')
+
+
+# Provider builders. Each imports its client module only when called, so
+# an unused provider's SDK is never loaded.
+def _build_gemini(model: Optional[str]):
+    from .gemini_client import GeminiClient
+    return GeminiClient(model)
+
+
+def _build_openai(model: Optional[str]):
+    from .openai_client import OpenAIClient
+    # OpenAIClient expects no positional arguments; create instance first
+    client = OpenAIClient()
+    # If a model was provided, try to configure the client with it.
+    # Prefer a setter method if available, otherwise fall back to setting an attribute.
+    if model is not None:
+        setter = getattr(client, 'set_model', None)
+        if callable(setter):
+            setter(model)
+        else:
+            setattr(client, 'model', model)
+    return client
+
+
+def _build_mock(model: Optional[str]):
+    from .mock_client import MockClient
+    return MockClient()
+
+
+_BUILDERS = {
+    'gemini': _build_gemini,
+    'openai': _build_openai,
+    'mock': _build_mock,
+}
@@ -6,10 +6,102 @@ attempts to safely extract text from multiple response shapes.
 """
 
 import os
-from typing import Optional, Dict, Any
-from dotenv import load_dotenv
+import re
+import asyncio
+import functools
+from typing import Optional, Dict, Any, Callable, Mapping
 
-import google.generativeai as genai
+# Prefix for the error text returned by process_request
+_ERROR_PREFIX = "خطا: "
+
+# .env file in the repository root
+_DOTENV_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), '.env')
+
+# Set once a GeminiClient has loaded the .env file
+_DOTENV_LOADED = False
+
+# Patterns used by _clean (GeminiClient._clean_and_localize), compiled once at import
+_SYSTEM_PREFIX_RE = re.compile(r"^\s*(System:|Assistant:|\[system\]|\(system\))\s*", re.IGNORECASE)
+_BRACKET_META_RE = re.compile(r"^\s*\[[^\]]+\]\s*")
+
+# Map a few common English greetings/phrases to Persian equivalents
+_GREETINGS = [
+    (re.compile(p, re.IGNORECASE), r) for p, r in {
+        r"^Hello\b[:,.!?]*\s*": "سلام! ",
+        r"^Hi\b[:,.!?]*\s*": "سلام! ",
+        r"^Hey\b[:,.!?]*\s*": "سلام! ",
+        r"^Greetings\b[:,.!?]*\s*": "سلام! ",
+        r"How can I help you( today)?\?*$": "چطور می‌تونم کمکتون کنم؟",
+        r"How can I assist you( today)?\?*$": "چطور می‌تونم کمکتون کنم؟",
+    }.items()
+]
+
+
+@functools.lru_cache(maxsize=2048)
+def _clean(text: str) -> str:
+    """Body of GeminiClient._clean_and_localize, memoized per reply text
+    (repeated prompts often get identical replies)."""
+    # Remove leading 'System:' or similar labels
+    text = _SYSTEM_PREFIX_RE.sub("", text)
+    # Remove bracketed metadata at start
+    text = _BRACKET_META_RE.sub("", text)
+
+    # Apply greeting replacements at the start
+    for pattern, replacement in _GREETINGS:
+        new_text = pattern.sub(replacement, text)
+        if new_text != text:
+            text = new_text
+            # stop after first successful greeting replacement
+            break
+
+    # Trim whitespace
+    text = text.strip()
+
+    # If output is still English and prompt is Persian, we can't auto-translate here;
+    # instead leave the core content but remove obvious English-only system notes.
+    # (Full translation would require an external translation API.)
+
+    return text
+
+
+def _extract_from_dict(raw: Mapping[str, Any]) -> Optional[str]:
+    """Pull text from a mapping response, preferring common keys."""
+    for key in ("output", "text", "content", "candidates"):
+        if key in raw and raw[key]:
+            val = raw[key]
+            if isinstance(val, list):
+                # Join candidate items if they're dicts or simple strings
+                parts = []
+                for item in val:
+                    if isinstance(item, dict):
+                        parts.append(str(item.get("content") or item.get("text") or ""))
+                    else:
+                        parts.append(str(item))
+                return "\n".join(p for p in parts if p)
+            return str(val)
+    return None
+
+
+def _extract_generic(raw: Any) -> Optional[str]:
+    """Slow path for response shapes without a dedicated extractor."""
+    if isinstance(raw, dict):
+        return _extract_from_dict(raw)
+
+    # Otherwise try common attributes on returned objects
+    for attr in ("text", "output", "content"):
+        val = getattr(raw, attr, None)
+        if val:
+            if isinstance(val, list):
+                return "\n".join(str(v) for v in val if v)
+            return str(val)
+    return None
+
+
+# Text extractors keyed by the exact response type
+_EXTRACTORS: Dict[type, Callable[[Any], Optional[str]]] = {
+    str: lambda raw: raw,
+    dict: _extract_from_dict,
+}
 
 
 class GeminiClient:
@@ -21,21 +113,39 @@ class GeminiClient:
             default `gemini-pro`.
     """
 
+    # The google.generativeai module, imported on first use and then shared
+    _genai: Any = None
+
+    @classmethod
+    def _load_genai(cls) -> Any:
+        """Import google.generativeai lazily so the SDK is only loaded when used."""
+        if cls._genai is None:
+            import google.generativeai as genai
+            cls._genai = genai
+        return cls._genai
+
     def __init__(self, model: Optional[str] = None):
         from utils.logger import logger
+        from dotenv import load_dotenv
         logger.info("Initializing Gemini client...")
         
-        # Try to load .env file
-        dotenv_path = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), '.env')
-        logger.info(f"Looking for .env file at: {dotenv_path}")
-        if os.path.exists(dotenv_path):
-            logger.info(".env file found, loading...")
-            load_dotenv(dotenv_path)
-        else:
-            logger.warning(f".env file not found at {dotenv_path}")
-            load_dotenv()  # Try default locations
-
-        api_key = os.getenv("GOOGLE_API_KEY")
+        from .factory import _google_key, _invalidate_env_cache
+
+        global _DOTENV_LOADED
+        # Load the .env file once, and only if the key is not already set
+        if not _DOTENV_LOADED and not os.environ.get("GOOGLE_API_KEY"):
+            logger.info("Looking for .env file at: %s", _DOTENV_PATH)
+            if os.path.exists(_DOTENV_PATH):
+                logger.info(".env file found, loading...")
+                load_dotenv(_DOTENV_PATH)
+            else:
+                logger.warning(".env file not found at %s", _DOTENV_PATH)
+                load_dotenv()  # Try default locations
+            _DOTENV_LOADED = True
+            # The .env file may have just added the key; drop any stale lookup
+            _invalidate_env_cache()
+
+        api_key = _google_key()
         if not api_key:
             logger.error("GOOGLE_API_KEY not found in environment variables after loading .env")
             raise ValueError("GOOGLE_API_KEY not found in environment variables")
@@ -44,37 +154,61 @@ class GeminiClient:
         # `configure` function; ensure the API key is available via environment
         # variable so the SDK can read it.
         os.environ["GOOGLE_API_KEY"] = api_key
+        genai = self._load_genai()
         self.model_name = model or os.getenv("GEMINI_MODEL") or "gemini-pro"
 
+        # Probe the SDK once and keep the bound generate call for all requests
+        self._model: Any = None
+        try:
+            self._generate_fn = self._resolve_generate_fn(genai)
+        except Exception as e:
+            logger.error("Failed to prepare Gemini model %s: %s", self.model_name, e)
+            self._generate_fn = None
+
+    def _resolve_generate_fn(self, genai: Any) -> Optional[Callable[[str], Any]]:
+        """Find the generation entry point exposed by the installed SDK version.
+
+        Returns a callable taking the prompt, or None if no known API exists.
+        """
+        GenModel = getattr(genai, "GenerativeModel", None)
+        if GenModel:
+            self._model = GenModel(self.model_name)
+            if hasattr(self._model, "generate_content"):
+                return self._model.generate_content
+
+        ClientClass = getattr(genai, "Client", None) or getattr(genai, "TextGenerationClient", None)
+        if ClientClass:
+            client = ClientClass()
+            if hasattr(client, "generate"):
+                return lambda p: client.generate(model=self.model_name, input=p)
+            if hasattr(client, "text_generation") and hasattr(client.text_generation, "generate"):
+                return lambda p: client.text_generation.generate(model=self.model_name, input=p)
+
+        responses = getattr(genai, "responses", None)
+        if responses and hasattr(responses, "generate"):
+            return lambda p: responses.generate(model=self.model_name, input=p)
+        return None
+
     def _extract_text(self, raw: Any) -> str:
         """Attempt to extract a text string from different response shapes."""
         if raw is None:
             return ""
 
-        # If the response is a mapping/dict prefer common keys
         try:
-            if isinstance(raw, dict):
-                for key in ("output", "text", "content", "candidates"):
-                    if key in raw and raw[key]:
-                        val = raw[key]
-                        if isinstance(val, list):
-                            # Join candidate items if they're dicts or simple strings
-                            parts = []
-                            for item in val:
-                                if isinstance(item, dict):
-                                    parts.append(str(item.get("content") or item.get("text") or ""))
-                                else:
-                                    parts.append(str(item))
-                            return "\n".join(p for p in parts if p)
-                        return str(val)
-
-            # Otherwise try common attributes on returned objects
-            for attr in ("text", "output", "content"):
-                val = getattr(raw, attr, None)
-                if val:
-                    if isinstance(val, list):
-                        return "\n".join(str(v) for v in val if v)
-                    return str(val)
+            # Exact types with a dedicated handler (str, dict)
+            handler = _EXTRACTORS.get(type(raw))
+            if handler is not None:
+                val = handler(raw)
+                if val is not None:
+                    return val
+            else:
+                # Most SDK responses expose `.text`; try it before anything else
+                val = getattr(raw, "text", None)
+                if val and isinstance(val, str):
+                    return val
+                val = _extract_generic(raw)
+                if val is not None:
+                    return val
         except Exception:
             # If extraction fails, fall back to string conversion
             pass
@@ -98,34 +232,20 @@ class GeminiClient:
         the caller can still implement intent detection on the returned text.
         """
         try:
-            # encapsulate the original synchronous generation logic so we can
-            # run it in a thread without blocking the event loop
+            generate = self._generate_fn
+            if generate is None:
+                raise RuntimeError("Failed to call generation API: 'generate' method not found on google.generativeai")
+
+            # wrap the synchronous SDK call so we can run it in a thread
+            # without blocking the event loop
             def _sync_generate(p: str):
-                raw = None
                 try:
-                    GenModel = getattr(genai, "GenerativeModel", None)
-                    if GenModel:
-                        model = GenModel(self.model_name)
-                        if hasattr(model, "generate_content"):
-                            return model.generate_content(p)
-
-                    ClientClass = getattr(genai, "Client", None) or getattr(genai, "TextGenerationClient", None)
-                    if ClientClass:
-                        client = ClientClass()
-                        if hasattr(client, "generate"):
-                            return client.generate(model=self.model_name, input=p)
-                        if hasattr(client, "text_generation") and hasattr(client.text_generation, "generate"):
-                            return client.text_generation.generate(model=self.model_name, input=p)
-
-                    responses = getattr(genai, "responses", None)
-                    if responses and hasattr(responses, "generate"):
-                        return responses.generate(model=self.model_name, input=p)
+                    return generate(p)
                 except Exception:
                     return None
-                return None
 
             # Run the generator in a background thread
-            raw = await __import__('asyncio').to_thread(_sync_generate, prompt)
+            raw = await asyncio.to_thread(_sync_generate, prompt)
             if raw is None:
                 raise RuntimeError("Failed to call generation API: 'generate' method not found on google.generativeai")
 
@@ -137,7 +257,7 @@ class GeminiClient:
 
         except Exception as exc:
             # Return a simple error message string (callers expect text)
-            return f"خطا: {str(exc)}"
+            return f"{_ERROR_PREFIX}{exc}" if exc.args else _ERROR_PREFIX
 
     def _clean_and_localize(self, text: str, prompt: str) -> str:
         """Perform lightweight cleaning and localization of model output.
@@ -149,43 +269,4 @@ class GeminiClient:
         """
         if not text:
             return ""
-
-        # Remove common system prefixes or bracketed metadata
-        import re
-        # Remove leading 'System:' or similar labels
-        text = re.sub(r"^\s*(System:|Assistant:|\[system\]|\(system\))\s*", "", text, flags=re.IGNORECASE)
-        # Remove bracketed metadata at start
-        text = re.sub(r"^\s*\[[^\]]+\]\s*", "", text)
-
-        # Map a few common English greetings/phrases to Persian equivalents
-        greetings_map = {
-            r"^Hello\b[:,.!?]*\s*": "سلام! ",
-            r"^Hi\b[:,.!?]*\s*": "سلام! ",
-            r"^Hey\b[:,.!?]*\s*": "سلام! ",
-            r"^Greetings\b[:,.!?]*\s*": "سلام! ",
-            r"How can I help you( today)?\?*$": "چطور می‌تونم کمکتون کنم؟",
-            r"How can I assist you( today)?\?*$": "چطور می‌تونم کمکتون کنم؟",
-        }
-
-        # If the prompt contains Persian characters, prefer a Persian greeting replacement
-        prefer_persian = bool(re.search(r"[\u0600-\u06FF]", prompt))
-
-        # Apply greeting replacements at the start
-        for pattern, replacement in greetings_map.items():
-            try:
-                new_text = re.sub(pattern, replacement, text, flags=re.IGNORECASE)
-                if new_text != text:
-                    text = new_text
-                    # stop after first successful greeting replacement
-                    break
-            except re.error:
-                continue
-
-        # Trim whitespace
-        text = text.strip()
-
-        # If output is still English and prompt is Persian, we can't auto-translate here;
-        # instead leave the core content but remove obvious English-only system notes.
-        # (Full translation would require an external translation API.)
-
-        return text
\ No newline at end of file
+        return _clean(text)
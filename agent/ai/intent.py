@@ -0,0 +1,74 @@
+"""Keyword-based intent detection for user prompts
+
+Maps a prompt to one of the response types the clients produce
+(product search, product analysis, recommendation) using fixed keyword
+sets. Everything is built once at import so classification is a single
+pass over the prompt: an Aho-Corasick automaton when `pyahocorasick` is
+installed, otherwise a precompiled regex.
+"""
+
+import re
+import sys
+from typing import Optional
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+# Response type tags, interned so type checks downstream compare by identity
+TYPE_SEARCH = sys.intern('product_search')
+TYPE_ANALYSIS = sys.intern('product_analysis')
+TYPE_RECOMMENDATION = sys.intern('recommendation')
+TYPE_GENERAL = sys.intern('general_response')
+TYPE_ERROR = sys.intern('error')
+
+_SEARCH_KWS = frozenset({'price', 'cost', 'buy', 'purchase'})
+_ANALYSIS_KWS = frozenset({'analyze', 'review', 'compare'})
+_RECOMMENDATION_KWS = frozenset({'recommend', 'suggest', 'alternative'})
+
+# When several categories match, the earlier one wins
+_CATEGORIES = (
+    (TYPE_SEARCH, _SEARCH_KWS),
+    (TYPE_ANALYSIS, _ANALYSIS_KWS),
+    (TYPE_RECOMMENDATION, _RECOMMENDATION_KWS),
+)
+
+# Keywords match anywhere in the prompt (e.g. 'prices', 'reviews')
+_KEYWORD_RE = re.compile(
+    '|'.join(sorted(_SEARCH_KWS | _ANALYSIS_KWS | _RECOMMENDATION_KWS, key=len, reverse=True)),
+    re.IGNORECASE | re.ASCII,
+)
+
+
+def _build_automaton():
+    """Build an automaton mapping each keyword to its response type."""
+    automaton = ahocorasick.Automaton()
+    for category, keywords in _CATEGORIES:
+        for kw in keywords:
+            automaton.add_word(kw, category)
+    automaton.make_automaton()
+    return automaton
+
+
+_AUTOMATON = _build_automaton() if ahocorasick is not None else None
+
+
+def classify_intent(prompt: str) -> Optional[str]:
+    """Return the response type implied by the prompt, or None for a general reply."""
+    if _AUTOMATON is not None:
+        matched = {category for _, category in _AUTOMATON.iter(prompt.lower())}
+        if not matched:
+            return None
+        for category, _ in _CATEGORIES:
+            if category in matched:
+                return category
+        return None
+
+    found = {m.lower() for m in _KEYWORD_RE.findall(prompt)}
+    if not found:
+        return None
+    for category, keywords in _CATEGORIES:
+        if found & keywords:
+            return category
+    return None
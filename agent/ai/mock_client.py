@@ -4,11 +4,12 @@ Returns canned responses synchronously/asynchronously to let the UI be tested.
 """
 from typing import Dict, Any
 
+from .intent import TYPE_GENERAL
+
 class MockClient:
     def __init__(self):
         self.name = "mock"
 
     async def process_request(self, prompt: str) -> Dict[str, Any]:
-        # Return a predictable response for testing
-        text = f"{prompt}"
-        return {"type": "general_response", "response": text}
+        # Return a predictable response for testing: echo the prompt back
+        return {"type": TYPE_GENERAL, "response": prompt}
\ No newline at end of file
@@ -4,8 +4,12 @@ OpenAI client implementation for Sofware-AI with async support
 
 import os
 import re
+import time
 import asyncio
-from typing import Optional, Any, Dict, Union, Mapping, TypedDict
+import hashlib
+import importlib.util
+from collections import OrderedDict
+from typing import Optional, Any, AsyncIterator, Callable, Dict, Union, Mapping, TypedDict
 
 # Import OpenAI but handle both old and new SDK versions
 try:
@@ -26,6 +30,104 @@ except ImportError:
 
 from dotenv import load_dotenv
 
+from .semantic_cache import SemanticCache
+from .response_store import ResponseStore, dumps as _dumps
+from .intent import (
+    classify_intent, TYPE_SEARCH, TYPE_ANALYSIS, TYPE_RECOMMENDATION, TYPE_GENERAL, TYPE_ERROR,
+)
+
+# Exact-match cache limits: entries older than this are recomputed, and the
+# least recently used entry is evicted once the cache is full
+EXACT_CACHE_TTL = 3600
+EXACT_CACHE_MAXSIZE = 1024
+
+# Cache lifetime (seconds) when replies are sampled (OAI_TEMPERATURE unset
+# or non-zero): a repeated prompt only gets the same reply within this window
+SAMPLED_CACHE_TTL = 60
+
+# Repo-root .env file, loaded at most once per process
+_DOTENV_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), '.env')
+_DOTENV_LOADED = False
+
+
+def _ensure_env() -> None:
+    """Load the .env file the first time a client is created."""
+    global _DOTENV_LOADED
+    if _DOTENV_LOADED:
+        return
+    from utils.logger import logger
+    logger.info("Looking for .env file at: %s", _DOTENV_PATH)
+    if os.path.exists(_DOTENV_PATH):
+        logger.info(".env file found, loading...")
+        load_dotenv(_DOTENV_PATH)
+    else:
+        logger.warning(".env file not found at %s", _DOTENV_PATH)
+        load_dotenv()  # Try default locations
+    _DOTENV_LOADED = True
+    # Keys read before the file was loaded are stale now
+    from .factory import _invalidate_env_cache
+    _invalidate_env_cache()
+
+
+def _fallback_extract(response: Any) -> str:
+    """Extract the reply text from any response shape (dicts, old SDK objects).
+
+    Falls back to the string form of the choice or the whole response when
+    no text field is found.
+    """
+    text = ""
+    try:
+        if response is None:
+            raise ValueError("No response received from API")
+
+        # Extract choice safely handling both object and dict responses
+        if isinstance(response, dict):
+            choices = response.get('choices', [])
+            choice = choices[0] if choices else None
+        else:
+            # Handle non-dict response object
+            choices = getattr(response, 'choices', [])
+            choice = choices[0] if choices else None
+        
+        if choice is None:
+            raise ValueError("No valid choices in response")
+
+        # Extract text from choice
+        if isinstance(choice, dict):
+            # Handle dictionary response format
+            if 'message' in choice and isinstance(choice['message'], dict):
+                text = choice['message'].get('content', '')
+            elif 'text' in choice:
+                text = choice.get('text', '')
+        else:
+            # Handle object response format
+            if hasattr(choice, 'message'):
+                msg = choice.message
+                if hasattr(msg, 'content'):
+                    text = getattr(msg, 'content', '')
+                elif isinstance(msg, dict):
+                    text = msg.get('content', '')
+            elif hasattr(choice, 'text'):
+                text = getattr(choice, 'text', '')
+        
+        # Ensure text is stripped
+        text = text.strip() if isinstance(text, str) else ""
+
+        # If we still don't have text, try to get a string representation
+        if not text:
+            text = str(choice).strip()
+
+        if not text:
+            text = str(response).strip()
+            
+    except Exception as e:
+        from utils.logger import logger
+        logger.error(f"Error processing response: {str(e)}")
+        text = str(response).strip() if response else ""
+
+    return text
+
+
 class ResponseDict(TypedDict, total=False):
     type: str
     error: str
@@ -34,21 +136,38 @@ class ResponseDict(TypedDict, total=False):
     analysis: str
     recommendations: list[str]
 
+def _search_response(prompt: str, text: str) -> ResponseDict:
+    return {'type': TYPE_SEARCH, 'search_params': {'query': prompt, 'response': text}}
+
+
+def _analysis_response(prompt: str, text: str) -> ResponseDict:
+    return {'type': TYPE_ANALYSIS, 'analysis': text}
+
+
+def _recommendation_response(prompt: str, text: str) -> ResponseDict:
+    return {'type': TYPE_RECOMMENDATION, 'recommendations': [r.strip() for r in text.split('\n') if r.strip()]}
+
+
+def _general_response(prompt: str, text: str) -> ResponseDict:
+    return {'type': TYPE_GENERAL, 'response': text}
+
+
+# Builds the response dictionary for each intent (None = no specific intent)
+_HANDLERS: Dict[Optional[str], Callable[[str, str], ResponseDict]] = {
+    TYPE_SEARCH: _search_response,
+    TYPE_ANALYSIS: _analysis_response,
+    TYPE_RECOMMENDATION: _recommendation_response,
+    None: _general_response,
+}
+
+
 class OpenAIClient:
     """Client for interacting with OpenAI models asynchronously"""
     def __init__(self):
         from utils.logger import logger
         logger.info("Initializing OpenAI client...")
         
-        # Try to load .env file
-        dotenv_path = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), '.env')
-        logger.info(f"Looking for .env file at: {dotenv_path}")
-        if os.path.exists(dotenv_path):
-            logger.info(".env file found, loading...")
-            load_dotenv(dotenv_path)
-        else:
-            logger.warning(f".env file not found at {dotenv_path}")
-            load_dotenv()  # Try default locations
+        _ensure_env()
 
         self.api_key = os.getenv("OPENAI_API_KEY")
         self.api_base = os.getenv("OPENAI_API_BASE")  # Optional API base URL override
@@ -67,6 +186,20 @@ class OpenAIClient:
             if self.api_base:
                 client_kwargs["base_url"] = self.api_base
             
+            # One pooled HTTP client for all requests, so concurrent and
+            # repeated calls reuse open (keep-alive) connections. httpx already
+            # asks for compressed responses, and the SDK decodes them straight
+            # into its pydantic models, so no JSON handling is done here.
+            self._http = None
+            if AsyncOpenAI is not None:
+                import httpx
+                self._http = httpx.AsyncClient(
+                    http2=importlib.util.find_spec("h2") is not None,
+                    limits=httpx.Limits(max_connections=64, max_keepalive_connections=32),
+                    timeout=30.0,
+                )
+                client_kwargs["http_client"] = self._http
+            
             if AsyncOpenAI is not None:
                 # Use async client (newest SDK)
                 self.client = AsyncOpenAI(**client_kwargs)
@@ -86,12 +219,23 @@ class OpenAIClient:
                     if self.api_base:
                         # Use setattr to avoid type checker complaints about old SDK
                         setattr(openai, 'api_base', self.api_base)
+                    # Pool connections for the old SDK too
+                    import requests
+                    from requests.adapters import HTTPAdapter
+                    session = requests.Session()
+                    adapter = HTTPAdapter(pool_connections=32, pool_maxsize=64)
+                    session.mount("https://", adapter)
+                    session.mount("http://", adapter)
+                    setattr(openai, 'requestssession', session)
                     self.client = None
                     self.is_async = False
                     # Store module for later use
                     self._openai = openai
                 
             self.model = os.getenv("OPENAI_MODEL", "gpt-3.5-turbo")
+            # Sampling temperature; None leaves the API default
+            temperature = os.getenv("OAI_TEMPERATURE")
+            self.temperature: Optional[float] = float(temperature) if temperature else None
             logger.info(f"OpenAI client initialized with model: {self.model}")
             if self.api_base:
                 logger.info(f"Using custom API base: {self.api_base}")
@@ -100,6 +244,82 @@ class OpenAIClient:
             logger.error(f"Failed to initialize OpenAI client: {e}")
             raise RuntimeError("Failed to initialize OpenAI client") from e
 
+        # Extra arguments for every completion call
+        self._sampling: Dict[str, Any] = {} if self.temperature is None else {"temperature": self.temperature}
+        # Only deterministic (temperature 0) replies are kept for the full TTL
+        self._cache_ttl = EXACT_CACHE_TTL if self.temperature == 0 else SAMPLED_CACHE_TTL
+
+        # Identical prompts are answered from this LRU before any embedding work
+        self._exact: "OrderedDict[str, tuple[float, ResponseDict]]" = OrderedDict()
+
+        # Responses to semantically equivalent prompts are served from memory
+        self._cache = SemanticCache(
+            threshold=float(os.getenv("SEMCACHE_THRESHOLD", "0.92")),
+            ttl=self._cache_ttl,
+        )
+        # Background semantic-cache writes, referenced until they finish
+        self._pending_puts: set = set()
+
+        # With OAI_CACHE_PERSIST=1 both caches are backed by a SQLite file and
+        # start out with the entries stored for this model by earlier runs
+        # (loaded on first lookup, once set_model() may have changed the model)
+        self._store: Optional[ResponseStore] = None
+        self._store_loaded = False
+        if os.getenv("OAI_CACHE_PERSIST", "").lower() in ("1", "true", "yes"):
+            try:
+                self._store = ResponseStore(ttl=self._cache_ttl)
+            except Exception as e:
+                logger.warning("Persistent response cache unavailable (%s)", e)
+
+    def set_model(self, model: str) -> None:
+        """Switch to another model; cached replies of the previous one are dropped."""
+        if model == self.model:
+            return
+        self.model = model
+        self._exact.clear()
+        self._cache.clear()
+        self._store_loaded = False
+
+    def _load_store(self) -> None:
+        """Seed both caches with the stored entries for the current model."""
+        self._store_loaded = True
+        now = time.time()
+        try:
+            entries = self._store.load(self.model, now, EXACT_CACHE_MAXSIZE)
+        except Exception as e:
+            from utils.logger import logger
+            logger.warning("Could not read the persistent response cache (%s)", e)
+            return
+        for key, _, response, _, ts in entries:
+            self._exact[key] = (ts, response)
+        self._cache.preload([(emb, response, now - ts) for _, _, response, emb, ts in entries if emb])
+
+    async def warmup(self) -> None:
+        """Open a connection to the API ahead of the first request (best effort)."""
+        # The embedding model loads on a background thread meanwhile
+        self._cache.start_loading()
+        if not (self.is_async and self.client is not None):
+            return
+        try:
+            await self.client.models.list()  # type: ignore
+        except Exception as e:
+            from utils.logger import logger
+            logger.debug("OpenAI warmup failed: %s", e)
+
+    async def aclose(self) -> None:
+        """Close the pooled HTTP connections, the semantic cache and the persistent cache."""
+        # Replies are already stored; only embeddings still being computed are dropped
+        for task in list(self._pending_puts):
+            task.cancel()
+        await asyncio.gather(*self._pending_puts, return_exceptions=True)
+        self._cache.close()
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+        if self._store is not None:
+            self._store.close()
+            self._store = None
+
     def _clean_and_localize(self, text: str, prompt: str) -> str:
         """Clean and localize the response text.
         
@@ -136,27 +356,171 @@ class OpenAIClient:
 
     async def process_request(self, prompt: str) -> ResponseDict:
         """Process a user request using OpenAI API asynchronously.
+
+        A response cached for an identical or semantically equivalent prompt
+        is returned without calling the API; successful API responses are cached.
+
         Args:
             prompt: User's request text
         Returns:
             A dictionary containing the response data with type information and optional fields
             based on the type of response generated
         """
+        key = self._cache_key(prompt)
+        cached = await self._lookup(key, prompt)
+        if cached is not None:
+            return cached
+
+        response_dict = await self._request(prompt)
+        if response_dict.get('type') != TYPE_ERROR:
+            self._remember(key, prompt, response_dict)
+        return response_dict
+
+    async def stream_request(self, prompt: str) -> AsyncIterator[str]:
+        """Stream the reply to a general (non-shopping) prompt token by token.
+
+        Cached replies are yielded in one piece. The full reply is cached
+        once the stream ends. Clients without async streaming support fall
+        back to process_request.
+
+        Args:
+            prompt: User's request text
+        Yields:
+            Successive pieces of the reply text
+        """
+        key = self._cache_key(prompt)
+        cached = await self._lookup(key, prompt)
+        if cached is not None and not cached.get('response'):
+            # Cached for a shopping prompt; there is no reply text to replay
+            cached = None
+        if cached is None and not (self.is_async and self.client is not None):
+            cached = await self.process_request(prompt)
+        if cached is not None:
+            yield cached.get('response') or cached.get('error', '')
+            return
+
+        parts: list[str] = []
+        stream = await self.client.chat.completions.create(  # type: ignore
+            model=self.model,
+            messages=[{"role": "user", "content": prompt}],
+            stream=True,
+            **self._sampling,
+        )
+        async for chunk in stream:
+            if not chunk.choices:
+                continue
+            token = chunk.choices[0].delta.content or ""
+            if token:
+                parts.append(token)
+                yield token
+
+        self._remember(key, prompt, {'type': TYPE_GENERAL, 'response': "".join(parts).strip()})
+
+    def _cache_key(self, prompt: str) -> str:
+        """Return the exact-match cache key for prompt."""
+        return hashlib.sha256(_dumps({"m": self.model, "p": prompt, "t": self.temperature})).hexdigest()
+
+    async def _lookup(self, key: str, prompt: str) -> Optional[ResponseDict]:
+        """Return a cached response from the exact or semantic cache, if any."""
+        if self._store is not None and not self._store_loaded:
+            self._load_store()
+        entry = self._exact.get(key)
+        if entry is not None:
+            if time.time() - entry[0] < self._cache_ttl:
+                self._exact.move_to_end(key)
+                return entry[1]
+            del self._exact[key]
+        if self._store is not None:
+            stored = self._store.get(key, time.time())
+            if stored is not None:
+                response_dict, ts = stored
+                self._exact[key] = (ts, response_dict)
+                if len(self._exact) > EXACT_CACHE_MAXSIZE:
+                    self._exact.popitem(last=False)
+                return response_dict
+        # Only general replies are reused for merely similar prompts: search,
+        # analysis and recommendation results are tied to the exact prompt
+        # (e.g. search_params.query), so a similar one must not get them
+        response_dict = await self._cache.aget(prompt)
+        if response_dict is not None and response_dict.get('type') == TYPE_GENERAL:
+            return response_dict
+        return None
+
+    def _remember(self, key: str, prompt: str, response_dict: ResponseDict) -> None:
+        """Store a successful response in the exact, persistent and semantic caches.
+
+        The exact-match and persistent entries are stored at once; embedding
+        a general reply's prompt (which may first have to load the model)
+        runs as a background task, so the reply is never held up by it.
+        """
+        now = time.time()
+        self._exact[key] = (now, response_dict)
+        if len(self._exact) > EXACT_CACHE_MAXSIZE:
+            self._exact.popitem(last=False)
+        if self._store is not None:
+            try:
+                self._store.put(key, self.model, prompt, response_dict, None, now)
+            except Exception as e:
+                from utils.logger import logger
+                logger.warning("Could not persist cached response (%s)", e)
+        if response_dict.get('type') == TYPE_GENERAL:
+            task = asyncio.get_running_loop().create_task(self._remember_semantic(key, prompt, response_dict))
+            self._pending_puts.add(task)
+            task.add_done_callback(self._pending_puts.discard)
+
+    async def _remember_semantic(self, key: str, prompt: str, response_dict: ResponseDict) -> None:
+        """Add a general reply to the semantic cache and store its prompt embedding."""
+        try:
+            emb = await self._cache.aput(prompt, response_dict)
+        except Exception as e:
+            from utils.logger import logger
+            logger.warning("Could not add response to the semantic cache (%s)", e)
+            return
+        if emb is not None and self._store is not None:
+            try:
+                self._store.set_embedding(key, emb.tobytes())
+            except Exception as e:
+                from utils.logger import logger
+                logger.warning("Could not persist cached response (%s)", e)
+
+    async def process_batch(self, prompts: list[str]) -> list[ResponseDict]:
+        """Process several prompts concurrently.
+
+        At most OAI_CONCURRENCY (default 8) requests are in flight at once.
+
+        Args:
+            prompts: User request texts
+        Returns:
+            Response dictionaries in the same order as prompts
+        """
+        sem = asyncio.Semaphore(int(os.getenv("OAI_CONCURRENCY", "8")))
+
+        async def one(prompt: str) -> ResponseDict:
+            async with sem:
+                return await self.process_request(prompt)
+
+        return await asyncio.gather(*(one(p) for p in prompts))
+
+    async def _request(self, prompt: str) -> ResponseDict:
+        """Call the API for prompt and build the response dictionary (uncached)."""
         try:
             response = None
+            messages = [{"role": "user", "content": prompt}]
             
             if self.client and hasattr(self.client, "chat"):
                 if self.is_async:
                     # New SDK with async support
                     response = await self.client.chat.completions.create(  # type: ignore
                         model=self.model,
-                        messages=[{"role": "user", "content": prompt}]
+                        messages=messages,
+                        **self._sampling
                     )
                 else:
                     # New SDK sync client
                     response = self.client.chat.completions.create(  # type: ignore
                         model=self.model,
-                        messages=[{"role": "user", "content": prompt}]
+                        messages=messages,
+                        **self._sampling
                     )
             else:
                 # older openai package
@@ -165,7 +529,8 @@ class OpenAIClient:
                     if chat_comp is not None and hasattr(chat_comp, "create"):
                         response = chat_comp.create(
                             model=self.model,
-                            messages=[{"role": "user", "content": prompt}]
+                            messages=messages,
+                            **self._sampling
                         )
                     else:
                         # Fallback to older Completion API if ChatCompletion isn't available.
@@ -175,99 +540,27 @@ class OpenAIClient:
                             response = completion_cls.create(
                                 model=self.model,
                                 prompt=prompt,
-                                max_tokens=150
+                                max_tokens=150,
+                                **self._sampling
                             )
                 else:
                     # No old-style openai package available
                     raise RuntimeError("No ChatCompletion or Completion API found in installed openai package")
 
-            # Extract text from different possible response shapes
-            text = ""
-            try:
-                if response is None:
-                    raise ValueError("No response received from API")
-
-                # Handle async response
-                if self.is_async and asyncio.iscoroutine(response):
-                    response_obj = await response
-                else:
-                    response_obj = response
+            # Handle async response
+            if self.is_async and asyncio.iscoroutine(response):
+                response = await response
 
-                # Extract choice safely handling both object and dict responses
-                if isinstance(response_obj, dict):
-                    choices = response_obj.get('choices', [])
-                    choice = choices[0] if choices else None
-                else:
-                    # Handle non-dict response object
-                    choices = getattr(response_obj, 'choices', [])
-                    choice = choices[0] if choices else None
-                
-                if choice is None:
-                    raise ValueError("No valid choices in response")
-
-                # Extract text from choice
-                if isinstance(choice, dict):
-                    # Handle dictionary response format
-                    if 'message' in choice and isinstance(choice['message'], dict):
-                        text = choice['message'].get('content', '')
-                    elif 'text' in choice:
-                        text = choice.get('text', '')
-                else:
-                    # Handle object response format
-                    if hasattr(choice, 'message'):
-                        msg = choice.message
-                        if hasattr(msg, 'content'):
-                            text = getattr(msg, 'content', '')
-                        elif isinstance(msg, dict):
-                            text = msg.get('content', '')
-                    elif hasattr(choice, 'text'):
-                        text = getattr(choice, 'text', '')
-                
-                # Ensure text is stripped
-                text = text.strip() if isinstance(text, str) else ""
-
-                # If we still don't have text, try to get a string representation
-                if not text and choice is not None:
-                    text = str(choice).strip()
-
-                if not text and response_obj is not None:
-                    text = str(response_obj).strip()
-                    
-            except Exception as e:
-                from utils.logger import logger
-                logger.error(f"Error processing response: {str(e)}")
-                text = str(response).strip() if response else ""
+            # Fast path: new SDK response objects
+            try:
+                text = response.choices[0].message.content.strip()
+            except (AttributeError, IndexError, TypeError):
+                text = ""
+            if not text:
+                text = _fallback_extract(response)
 
-            # Simple action type detection (can be improved)
-            lower_prompt = prompt.lower()
-            
-            response_dict: ResponseDict = {'type': 'general_response'}
-            
-            if any(keyword in lower_prompt for keyword in ['price', 'cost', 'buy', 'purchase']):
-                response_dict.update({
-                    'type': 'product_search',
-                    'search_params': {
-                        'query': prompt,
-                        'response': text
-                    }
-                })
-            elif any(keyword in lower_prompt for keyword in ['analyze', 'review', 'compare']):
-                response_dict.update({
-                    'type': 'product_analysis',
-                    'analysis': text
-                })
-            elif any(keyword in lower_prompt for keyword in ['recommend', 'suggest', 'alternative']):
-                response_dict.update({
-                    'type': 'recommendation',
-                    'recommendations': [r.strip() for r in text.split('\n') if r.strip()]
-                })
-            else:
-                response_dict.update({
-                    'type': 'general_response',
-                    'response': text
-                })
-                
-            return response_dict
+            # Simple action type detection based on prompt keywords
+            return _HANDLERS[classify_intent(prompt)](prompt, text)
             
         except Exception as e:
-            return {'type': 'error', 'error': str(e)}
\ No newline at end of file
+            return {'type': TYPE_ERROR, 'error': str(e)}
\ No newline at end of file
@@ -0,0 +1,111 @@
+"""Persistent response cache for AI clients
+
+Keeps responses (and optionally the prompt embedding used by the
+semantic cache) in a SQLite database so cached answers survive restarts.
+The database runs in WAL mode, so reads are not blocked by a write in
+progress.
+
+Responses are stored as JSON, serialized with `orjson` when installed
+and the standard `json` module otherwise.
+"""
+
+import os
+import sqlite3
+import threading
+from typing import Any, List, Optional, Tuple
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+    import json
+
+DEFAULT_PATH = os.path.join(os.path.expanduser("~"), ".sofware_ai", "cache.db")
+
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS cache("
+    "hash BLOB PRIMARY KEY, prompt TEXT, resp BLOB, emb BLOB, ts INTEGER, model TEXT)"
+)
+
+
+def dumps(obj: Any) -> bytes:
+    """Serialize obj to compact JSON bytes with sorted keys."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS)
+    return json.dumps(obj, sort_keys=True, separators=(",", ":"), ensure_ascii=False).encode()
+
+
+def loads(data: bytes) -> Any:
+    """Parse JSON bytes produced by dumps."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+class ResponseStore:
+    """SQLite table of cached responses keyed by prompt hash.
+
+    Args:
+        path: Database file (created with its directory if missing)
+        ttl: Seconds after which a stored response is no longer returned
+    """
+
+    def __init__(self, path: str = DEFAULT_PATH, ttl: float = 3600):
+        self.path = path
+        self.ttl = ttl
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(_SCHEMA)
+        # Databases written before the model column existed; their rows stay unloaded
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(cache)")}
+        if "model" not in columns:
+            self._conn.execute("ALTER TABLE cache ADD COLUMN model TEXT")
+        self._conn.commit()
+        # The connection is shared between threads; serialize access to it
+        self._lock = threading.Lock()
+
+    def get(self, key: str, now: float) -> Optional[Tuple[Any, int]]:
+        """Return the unexpired (response, ts) stored under key, if any."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT resp, ts FROM cache WHERE hash=? AND ts>?", (key, int(now - self.ttl))
+            ).fetchone()
+        return (loads(row[0]), row[1]) if row else None
+
+    def put(self, key: str, model: str, prompt: str, response: Any,
+            emb: Optional[bytes], now: float) -> None:
+        """Insert or replace the entry for key."""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache(hash, model, prompt, resp, emb, ts) VALUES(?,?,?,?,?,?)",
+                (key, model, prompt, dumps(response), emb, int(now)),
+            )
+            self._conn.commit()
+
+    def set_embedding(self, key: str, emb: bytes) -> None:
+        """Attach the prompt embedding to the entry stored under key."""
+        with self._lock:
+            self._conn.execute("UPDATE cache SET emb=? WHERE hash=?", (emb, key))
+            self._conn.commit()
+
+    def load(self, model: str, now: float, limit: int) -> List[Tuple[str, str, Any, Optional[bytes], int]]:
+        """Return up to limit unexpired entries for model, oldest first, and purge its expired ones.
+
+        Each entry is (hash, prompt, response, embedding bytes or None, ts).
+        """
+        cutoff = int(now - self.ttl)
+        with self._lock:
+            self._conn.execute("DELETE FROM cache WHERE model=? AND ts<=?", (model, cutoff))
+            self._conn.commit()
+            rows = self._conn.execute(
+                "SELECT hash, prompt, resp, emb, ts FROM cache WHERE model=? AND ts>? "
+                "ORDER BY ts DESC LIMIT ?",
+                (model, cutoff, limit),
+            ).fetchall()
+        return [(key, prompt, loads(resp), emb, ts) for key, prompt, resp, emb, ts in reversed(rows)]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
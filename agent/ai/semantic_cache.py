@@ -0,0 +1,339 @@
+"""Semantic response cache for AI clients
+
+Stores responses together with a sentence embedding of the prompt and
+returns a stored response when a new prompt is close enough in meaning
+(cosine similarity above a threshold). This lets rephrased questions
+skip the network round-trip to the model.
+
+`sentence-transformers` and `numpy` are optional: when they are not
+installed the cache disables itself and every lookup is a miss.
+
+With `hnswlib` installed, lookups use an approximate nearest-neighbour
+(HNSW) index, so they stay fast as the cache grows; otherwise a numpy
+matrix product over all entries is used, with embeddings stored as int8
+plus one float32 scale per entry (a quarter of the float32 size).
+
+The async methods (`aget`/`aput`) run the model on a worker thread and
+coalesce prompts embedded at the same time into one batched forward pass,
+so the event loop is never blocked by the model. The model itself is
+loaded (possibly downloaded) on a daemon thread, so a load in progress
+never keeps the process alive at exit. Call `close()` when done.
+"""
+
+import time
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, List, Optional
+
+try:
+    import hnswlib
+except ImportError:
+    hnswlib = None
+
+DEFAULT_MODEL = 'sentence-transformers/all-MiniLM-L6-v2'
+
+# Most prompts embedded in one forward pass
+EMBED_BATCH_SIZE = 32
+
+# HNSW index parameters; the index grows by doubling when full
+HNSW_INITIAL_CAPACITY = 100_000
+HNSW_EF_CONSTRUCTION = 200
+HNSW_M = 16
+HNSW_EF_SEARCH = 50
+
+
+class SemanticCache:
+    """In-memory cache of responses keyed by prompt embeddings.
+
+    Args:
+        threshold: Minimum cosine similarity for a cached entry to count as a hit
+        ttl: Seconds after which an entry is ignored (and eventually dropped)
+        model_name: SentenceTransformer model used to embed prompts
+    """
+
+    def __init__(self, threshold: float = 0.92, ttl: float = 3600, model_name: str = DEFAULT_MODEL):
+        self.threshold = threshold
+        self.ttl = ttl
+        self.model_name = model_name
+        self.enabled = True
+        self._model: Any = None
+        self._np: Any = None
+        # Row _start + i of _embeddings/_scales (numpy) or label _first_label + i
+        # (HNSW index) belongs to _responses[i] / _inserted_at[i]
+        self._embeddings: Any = None
+        self._scales: Any = None
+        self._start = 0
+        self._index: Any = None
+        self._first_label = 0
+        self._responses: List[Any] = []
+        self._inserted_at: List[float] = []
+        # Embedding worker thread and the queue feeding it (bound to one event loop)
+        self._pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix='semcache')
+        self._queue: Optional[asyncio.Queue] = None
+        self._queue_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._worker: Optional[asyncio.Task] = None
+        # Background model load started by start_loading(); resolves to _load_model()'s result
+        self._loading: Optional[asyncio.Future] = None
+
+    def _load_model(self) -> bool:
+        """Load the embedding model on first use; disable the cache if unavailable."""
+        if self._model is not None:
+            return True
+        if not self.enabled:
+            return False
+        try:
+            import numpy as np
+            from sentence_transformers import SentenceTransformer
+            self._np = np
+            self._model = SentenceTransformer(self.model_name)
+            return True
+        except Exception as e:
+            from utils.logger import logger
+            logger.warning("Semantic cache disabled (%s)", e)
+            self.enabled = False
+            return False
+
+    def _embed(self, text: str) -> Any:
+        """Return the L2-normalized embedding of text as a 1-D float32 array."""
+        return self._encode([text])[0]
+
+    def _encode(self, texts: List[str]) -> Any:
+        """Return L2-normalized float32 embeddings of texts, one row per text."""
+        emb = self._model.encode(texts, normalize_embeddings=True, convert_to_numpy=True)
+        return emb.astype(self._np.float32)
+
+    async def embed(self, text: str) -> Any:
+        """Embed text on the worker thread, batched with concurrent callers."""
+        loop = asyncio.get_running_loop()
+        if self._queue_loop is not loop:
+            self._queue = asyncio.Queue()
+            self._queue_loop = loop
+            self._worker = loop.create_task(self._drain_queue())
+        future = loop.create_future()
+        await self._queue.put((text, future))
+        return await future
+
+    async def _drain_queue(self) -> None:
+        """Embed queued texts in batches of up to EMBED_BATCH_SIZE."""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            while len(batch) < EMBED_BATCH_SIZE and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            try:
+                embeddings = await loop.run_in_executor(self._pool, self._encode, [t for t, _ in batch])
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            for (_, future), emb in zip(batch, embeddings):
+                if not future.done():
+                    future.set_result(emb)
+
+    def start_loading(self) -> None:
+        """Start loading the model on a daemon thread, without waiting for it.
+
+        Must be called from a running event loop.
+        """
+        if self._model is not None or not self.enabled or self._loading is not None:
+            return
+        loop = asyncio.get_running_loop()
+        loading = self._loading = loop.create_future()
+
+        def settle(loaded: bool) -> None:
+            if not loading.done():
+                loading.set_result(loaded)
+
+        def load() -> None:
+            loaded = self._load_model()
+            try:
+                loop.call_soon_threadsafe(settle, loaded)
+            except RuntimeError:
+                pass  # The loop was closed while the model loaded
+
+        threading.Thread(target=load, name='semcache-load', daemon=True).start()
+
+    async def _aload_model(self) -> bool:
+        """Like _load_model, but waits for the background load instead of blocking."""
+        if self._model is not None:
+            return True
+        if not self.enabled:
+            return False
+        self.start_loading()
+        # A cancelled caller must not cancel the load shared with other callers
+        return await asyncio.shield(self._loading)
+
+    def _drop_expired(self, now: float) -> None:
+        """Remove entries older than ttl (entries are kept in insertion order)."""
+        stale = 0
+        while stale < len(self._inserted_at) and now - self._inserted_at[stale] >= self.ttl:
+            stale += 1
+        if stale:
+            if self._index is not None:
+                for label in range(self._first_label, self._first_label + stale):
+                    self._index.mark_deleted(label)
+                self._first_label += stale
+            else:
+                self._start += stale
+            del self._responses[:stale]
+            del self._inserted_at[:stale]
+
+    def _search(self, query: Any) -> Optional[Any]:
+        """Return the response whose prompt embedding is closest to query, if close enough."""
+        if not self._responses:
+            return None
+        if self._index is not None:
+            labels, distances = self._index.knn_query(query, k=1)
+            # Cosine space distance is 1 - similarity
+            if 1.0 - distances[0, 0] >= self.threshold:
+                return self._responses[int(labels[0, 0]) - self._first_label]
+            return None
+        n = len(self._responses)
+        q, q_scale = self._quantize(query)
+        scores = self._embeddings[self._start:self._start + n] @ q.astype(self._np.int32)
+        scores = scores * (self._scales[self._start:self._start + n] * q_scale)
+        best = int(scores.argmax())
+        if scores[best] >= self.threshold:
+            return self._responses[best]
+        return None
+
+    def _insert(self, emb: Any, response: Any) -> None:
+        """Append one entry with embedding emb (1-D)."""
+        if hnswlib is not None:
+            self._index_add(emb[None, :])
+        else:
+            self._matrix_add(emb)
+        self._responses.append(response)
+        self._inserted_at.append(time.monotonic())
+
+    def _quantize(self, emb: Any) -> tuple:
+        """Return emb as int8 values and the scale that maps them back to floats."""
+        np = self._np
+        peak = float(np.abs(emb).max())
+        scale = peak / 127.0 if peak > 0 else 1.0
+        return np.round(emb / scale).astype(np.int8), np.float32(scale)
+
+    def _matrix_add(self, emb: Any) -> None:
+        """Append emb (quantized) to the int8 matrix, growing it by doubling."""
+        np = self._np
+        n = len(self._responses)
+        if self._embeddings is None or self._start + n >= self._embeddings.shape[0]:
+            # Grow (or compact out expired rows) into a fresh buffer
+            capacity = max(64, 2 * n)
+            embeddings = np.empty((capacity, emb.shape[0]), dtype=np.int8)
+            scales = np.empty(capacity, dtype=np.float32)
+            if n:
+                embeddings[:n] = self._embeddings[self._start:self._start + n]
+                scales[:n] = self._scales[self._start:self._start + n]
+            self._embeddings, self._scales, self._start = embeddings, scales, 0
+        row = self._start + n
+        self._embeddings[row], self._scales[row] = self._quantize(emb)
+
+    def _index_add(self, embs: Any) -> None:
+        """Add rows of embs to the HNSW index under the next labels, creating or growing the index."""
+        if self._index is None:
+            self._index = hnswlib.Index(space='cosine', dim=embs.shape[1])
+            # Expired entries are only marked deleted; their slots are reused
+            self._index.init_index(max_elements=HNSW_INITIAL_CAPACITY,
+                                   ef_construction=HNSW_EF_CONSTRUCTION, M=HNSW_M,
+                                   allow_replace_deleted=True)
+            self._index.set_ef(HNSW_EF_SEARCH)
+            self._first_label = 0
+        needed = len(self._responses) + embs.shape[0]
+        if needed > self._index.get_max_elements():
+            self._index.resize_index(max(needed, 2 * self._index.get_max_elements()))
+        first = self._first_label + len(self._responses)
+        self._index.add_items(embs, list(range(first, first + embs.shape[0])), replace_deleted=True)
+
+    def get(self, prompt: str) -> Optional[Any]:
+        """Return the cached response for a semantically equivalent prompt, if any."""
+        if not self._responses or not self._load_model():
+            return None
+        self._drop_expired(time.monotonic())
+        if not self._responses:
+            return None
+        return self._search(self._embed(prompt))
+
+    def put(self, prompt: str, response: Any) -> None:
+        """Store a response for prompt."""
+        if not self._load_model():
+            return
+        self._insert(self._embed(prompt), response)
+
+    async def aget(self, prompt: str) -> Optional[Any]:
+        """Async get(): embeds the prompt without blocking the event loop.
+
+        Never waits for the model to load: until it has, lookups are misses
+        and the load is started in the background.
+        """
+        if not self._responses:
+            return None
+        if self._model is None:
+            self.start_loading()
+            return None
+        self._drop_expired(time.monotonic())
+        if not self._responses:
+            return None
+        return self._search(await self.embed(prompt))
+
+    async def aput(self, prompt: str, response: Any) -> Optional[Any]:
+        """Async put(): embeds the prompt without blocking the event loop.
+
+        Returns the prompt embedding (None when the cache is disabled).
+        """
+        if not await self._aload_model():
+            return None
+        emb = await self.embed(prompt)
+        self._insert(emb, response)
+        return emb
+
+    def preload(self, entries: List[tuple]) -> None:
+        """Insert previously computed entries without running the model.
+
+        Args:
+            entries: (float32 embedding bytes, response, age in seconds) tuples, oldest first
+        """
+        if not entries or not self.enabled:
+            return
+        try:
+            import numpy as np
+        except ImportError:
+            return
+        self._np = np
+        embs = np.stack([np.frombuffer(emb, dtype=np.float32) for emb, _, _ in entries])
+        now = time.monotonic()
+        if hnswlib is not None:
+            self._index_add(embs)
+        for i, (_, response, age) in enumerate(entries):
+            if hnswlib is None:
+                self._matrix_add(embs[i])
+            self._responses.append(response)
+            self._inserted_at.append(now - age)
+
+    def close(self) -> None:
+        """Stop the embedding worker and shut down its thread.
+
+        Prompts still waiting to be embedded are cancelled. A model load in
+        progress is left to finish on its daemon thread.
+        """
+        if self._worker is not None:
+            self._worker.cancel()
+            self._worker = None
+        if self._queue is not None:
+            while not self._queue.empty():
+                _, future = self._queue.get_nowait()
+                future.cancel()
+        self._queue = self._queue_loop = None
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    def clear(self) -> None:
+        """Forget all cached entries."""
+        self._embeddings = None
+        self._scales = None
+        self._start = 0
+        self._index = None
+        self._first_label = 0
+        self._responses.clear()
+        self._inserted_at.clear()
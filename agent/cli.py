@@ -10,10 +10,22 @@ import os
 import sys
 import asyncio
 import inspect
+import threading
 from typing import Optional, Dict, Any
 from agent.executor import WebExecutor
 from agent.ai.factory import AIFactory
+from agent.ai.intent import classify_intent
 from utils.logger import logger
+from utils import event_loop
+
+try:
+    from aioconsole import ainput as console_ainput
+except ImportError:
+    console_ainput = None
+
+
+# How a search result is printed
+RESULT_TEMPLATE = "\nProduct: {title}\nPrice: {price}\nStore: {store}\nLink: {url}\n"
 
 
 def select_ai_model() -> Any:
@@ -64,6 +76,138 @@ def select_ai_model() -> Any:
         return factory.create_client()
 
 
+def split_batch(user_prompt: str) -> Optional[list[str]]:
+    """Split a multi-prompt input into its prompts
+    
+    Prompts are either separated by '||' or read one per line from
+    '@file:<path>'.
+    
+    Returns:
+        The list of prompts, or None if the input is a single prompt
+    """
+    if user_prompt.startswith("@file:"):
+        with open(user_prompt[len("@file:"):].strip(), encoding="utf-8") as f:
+            lines = f.read().splitlines()
+    elif "||" in user_prompt:
+        lines = user_prompt.split("||")
+    else:
+        return None
+    return [line.strip() for line in lines if line.strip()]
+
+
+async def resolve(candidate: Any) -> Any:
+    """Await candidate if it is awaitable (async clients), else return it as is"""
+    if asyncio.iscoroutine(candidate) or inspect.isawaitable(candidate):
+        return await candidate
+    return candidate
+
+
+async def ainput(prompt: str) -> str:
+    """input() that lets the event loop keep running while the user types
+    
+    Uses aioconsole when installed. On a POSIX terminal the loop watches
+    stdin with add_reader, so no thread is left blocked on it at exit.
+    Otherwise (Windows, redirected stdin) input() runs on a regular thread.
+    """
+    if console_ainput is not None:
+        return await console_ainput(prompt)
+    loop = asyncio.get_running_loop()
+    if sys.stdin.isatty():
+        try:
+            return await _read_terminal_line(loop, prompt)
+        except NotImplementedError:
+            # The Proactor loop on Windows can't watch stdin
+            pass
+    future = loop.create_future()
+
+    def settle(result: Any, error: Optional[BaseException]) -> None:
+        if future.done():
+            return
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+    def read() -> None:
+        try:
+            line = input(prompt)
+        except BaseException as e:
+            loop.call_soon_threadsafe(settle, None, e)
+        else:
+            loop.call_soon_threadsafe(settle, line, None)
+
+    threading.Thread(target=read, name="cli-input").start()
+    return await future
+
+
+async def _read_terminal_line(loop: asyncio.AbstractEventLoop, prompt: str) -> str:
+    """Read one line from a terminal stdin without blocking the event loop
+    
+    Raises:
+        EOFError: If stdin is closed before a line is entered
+        NotImplementedError: If the event loop can't watch stdin
+    """
+    fd = sys.stdin.fileno()
+    future = loop.create_future()
+    chunks = []
+
+    def on_readable() -> None:
+        try:
+            # A terminal in canonical mode hands over at most one line per read
+            chunk = os.read(fd, 4096)
+        except BlockingIOError:
+            return
+        except OSError as e:
+            if not future.done():
+                future.set_exception(e)
+            return
+        if not chunk and not chunks:
+            if not future.done():
+                future.set_exception(EOFError())
+            return
+        chunks.append(chunk)
+        if (not chunk or chunk.endswith(b"\n")) and not future.done():
+            line = b"".join(chunks).decode(sys.stdin.encoding or "utf-8", errors="replace")
+            future.set_result(line.rstrip("\r\n"))
+
+    loop.add_reader(fd, on_readable)
+    try:
+        sys.stdout.write(prompt)
+        sys.stdout.flush()
+        return await future
+    finally:
+        loop.remove_reader(fd)
+
+
+async def show_response(response: Any, executor: WebExecutor) -> None:
+    """Print a client response (running a web search with executor for search responses)"""
+    # Normalize response dicts
+    if isinstance(response, dict):
+        rtype = response.get("type")
+        if rtype == "product_search" and "search_params" in response:
+            print("\nSearch Results:")
+            async for result in executor.execute_search(response["search_params"]):
+                # One write per product; flushed so each store's results show up on arrival
+                sys.stdout.write(RESULT_TEMPLATE.format_map(result))
+                sys.stdout.flush()
+        elif rtype == "product_analysis" and "analysis" in response:
+            print("\nProduct Analysis:")
+            print(response["analysis"])
+        elif rtype == "recommendation" and "recommendations" in response:
+            print("\nRecommendations:")
+            for recommendation in response["recommendations"]:
+                print(f"- {recommendation}")
+        elif rtype == "general_response" and "response" in response:
+            print(f"\n{response["response"]}")
+        elif response.get("error"):
+            print(f"\nSorry, an error occurred: {response.get("error")}")
+        else:
+            # Fallback: print the whole dict
+            print("\n", response)
+    else:
+        print("\n", str(response))
+
+
 async def main() -> int:
     """Main CLI entry point
     
@@ -84,68 +228,69 @@ async def main() -> int:
         client = select_ai_model()
         print("\nAI model selected successfully!")
         
-        while True:
-            try:
-                # Get user request
-                user_prompt = input("\nPlease enter your request (or \'exit\' to quit): ")
+        # One executor (and HTTP session) for all searches in this session
+        executor = WebExecutor()
+        
+        # Open the API connection while the user types the first request
+        warmup = asyncio.create_task(client.warmup()) if hasattr(client, "warmup") else None
+        
+        try:
+            while True:
+                try:
+                    # Get user request
+                    user_prompt = await ainput("\nPlease enter your request (or \'exit\' to quit): ")
                 
-                if user_prompt.lower() in ["exit", "quit"]:
-                    print("Goodbye!")
-                    break
+                    if user_prompt.lower() in ["exit", "quit"]:
+                        print("Goodbye!")
+                        break
                 
-                try:
-                    # Process the request (support sync and async clients)
-                    resp_candidate = client.process_request(user_prompt)
-                    if asyncio.iscoroutine(resp_candidate) or inspect.isawaitable(resp_candidate):
-                        response = await resp_candidate
-                    else:
-                        response = resp_candidate
-
-                    # Normalize response dicts
-                    if isinstance(response, dict):
-                        rtype = response.get("type")
-                        if rtype == "product_search" and "search_params" in response:
-                            executor = WebExecutor()
-                            results = await executor.execute_search(response["search_params"])
-                            print("\nSearch Results:")
-                            for result in results:
-                                print(f"\nProduct: {result["title"]}")
-                                print(f"Price: {result["price"]}")
-                                print(f"Store: {result["store"]}")
-                                print(f"Link: {result["url"]}")
-                        elif rtype == "product_analysis" and "analysis" in response:
-                            print("\nProduct Analysis:")
-                            print(response["analysis"])
-                        elif rtype == "recommendation" and "recommendations" in response:
-                            print("\nRecommendations:")
-                            for recommendation in response["recommendations"]:
-                                print(f"- {recommendation}")
-                        elif rtype == "general_response" and "response" in response:
-                            print(f"\n{response["response"]}")
-                        elif response.get("error"):
-                            print(f"\nSorry, an error occurred: {response.get("error")}")
+                    try:
+                        batch = split_batch(user_prompt)
+                        if batch is not None:
+                            # Several prompts: run them concurrently when the client supports it
+                            if hasattr(client, "process_batch"):
+                                responses = await client.process_batch(batch)
+                            else:
+                                responses = [await resolve(client.process_request(p)) for p in batch]
+                            for prompt, response in zip(batch, responses):
+                                print(f"\n>>> {prompt}")
+                                await show_response(response, executor)
+                        elif (sys.stdout.isatty() and hasattr(client, "stream_request")
+                                and classify_intent(user_prompt) is None):
+                            # General question on a terminal: print the reply as it arrives
+                            print()
+                            async for token in client.stream_request(user_prompt):
+                                sys.stdout.write(token)
+                                sys.stdout.flush()
+                            print()
                         else:
-                            # Fallback: print the whole dict
-                            print("\n", response)
-                    else:
-                        print("\n", str(response))
+                            # Process the request (support sync and async clients)
+                            response = await resolve(client.process_request(user_prompt))
+                            await show_response(response, executor)
+                
+                    except Exception as e:
+                        print(f"\nSorry, an error occurred while processing: {str(e)}")
+                        logger.error(f"Request processing error: {e}")
+                        print("Please try again.")
+                        continue
                 
+                except EOFError:
+                    print("\nThe program ended unexpectedly.")
+                    break
+                except KeyboardInterrupt:
+                    print("\nThe program was stopped by the user.")
+                    break
                 except Exception as e:
-                    print(f"\nSorry, an error occurred while processing: {str(e)}")
-                    logger.error(f"Request processing error: {e}")
-                    print("Please try again.")
+                    print(f"\nAn error occurred: {str(e)}")
+                    logger.error(f"Main loop error: {e}")
                     continue
-                
-            except EOFError:
-                print("\nThe program ended unexpectedly.")
-                break
-            except KeyboardInterrupt:
-                print("\nThe program was stopped by the user.")
-                break
-            except Exception as e:
-                print(f"\nAn error occurred: {str(e)}")
-                logger.error(f"Main loop error: {e}")
-                continue
+        finally:
+            if warmup is not None:
+                warmup.cancel()
+            await executor.close()
+            # Release pooled connections held by the client
+            if hasattr(client, "aclose"):
+                await client.aclose()
     
     except Exception as e:
         print(f"Fatal error: {str(e)}")
@@ -157,8 +302,12 @@ async def main() -> int:
 
 if __name__ == "__main__":
     try:
-        exit_code = asyncio.run(main())
+        exit_code = event_loop.run(main())
         sys.exit(exit_code)
+    except KeyboardInterrupt:
+        # Ctrl+C while awaiting: main() was cancelled and has cleaned up
+        print("\nThe program was stopped by the user.")
+        sys.exit(130)
     except Exception as e:
         logger.exception("Unhandled error in CLI")
         sys.exit(1)
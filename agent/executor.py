@@ -4,38 +4,106 @@ The WebExecutor class is tasked with searching various websites based on the
 search plan received from the planner and extracting product information.
 """
 
-from typing import Dict, List
+from typing import AsyncIterator, Dict, List, Optional
+import asyncio
 import aiohttp
+from utils.logger import logger
+
+# Store searched when the plan names none
+DEFAULT_STORE = 'فروشگاه نمونه'
+
+# Most store searches running at the same time
+MAX_CONCURRENT_FETCHES = 8
 
 class WebExecutor:
-    async def execute_search(self, search_plan: Dict) -> List[Dict]:
+    """
+    Runs web searches over one shared HTTP session. Use it as an async context
+    manager (or call close()) so the session's connections are released.
+    """
+
+    def __init__(self):
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._fetch_limit = asyncio.Semaphore(MAX_CONCURRENT_FETCHES)
+
+    async def __aenter__(self) -> "WebExecutor":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.close()
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Return the shared session, creating it on first use (inside the event loop)"""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=32, ttl_dns_cache=300)
+            )
+        return self._session
+
+    async def close(self) -> None:
+        """Close the shared HTTP session"""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def execute_search(self, search_plan: Dict) -> AsyncIterator[Dict]:
         """
         Execute web search based on the plan received from planner
 
+        Stores are searched concurrently and products are yielded as soon as
+        their store responds, so the fastest stores show up first.
+
         Args:
             search_plan: A dictionary containing search information such as:
                 - query: Search term
                 - stores: List of stores
                 - filters: Search filters
 
-        Returns:
-            A list of dictionaries where each contains product information:
+        Yields:
+            Dictionaries where each contains product information:
                 - title: Product name
                 - price: Price
                 - store: Store name
                 - url: Product link
         """
-        results = []
-        # TODO: Implement web search functionality
-        # Real online store search logic should be implemented here
-        
-        # For now, return a sample result for testing
-        sample_result = {
-            'title': 'نمونه محصول',
-            'price': '1000000 تومان',
-            'store': 'فروشگاه نمونه',
-            'url': 'https://example.com/product'
-        }
-        results.append(sample_result)
-        
-        return results
\ No newline at end of file
+        query = search_plan.get('query', '')
+        filters = search_plan.get('filters') or {}
+        stores = search_plan.get('stores') or [DEFAULT_STORE]
+
+        async def fetch(store: str) -> List[Dict]:
+            # A failing store doesn't fail the search
+            try:
+                return await self._fetch_store(store, query, filters)
+            except Exception as e:
+                logger.warning("Search in store %s failed: %s", store, e)
+                return []
+
+        tasks = [asyncio.ensure_future(fetch(store)) for store in stores]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                for result in await next_done:
+                    yield result
+        finally:
+            # Stop outstanding store searches if the caller stops early
+            for task in tasks:
+                task.cancel()
+
+    async def _fetch_store(self, store: str, query: str, filters: Dict) -> List[Dict]:
+        """
+        Search a single store (at most MAX_CONCURRENT_FETCHES stores at a time)
+
+        Returns:
+            Product dictionaries in the format yielded by execute_search
+        """
+        async with self._fetch_limit:
+            # TODO: Implement web search functionality
+            # Real online store search logic should be implemented here,
+            # fetching store pages with the shared self._get_session()
+
+            # For now, return a sample result for testing
+            sample_result = {
+                'title': 'نمونه محصول',
+                'price': '1000000 تومان',
+                'store': store,
+                'url': 'https://example.com/product'
+            }
+            return [sample_result]
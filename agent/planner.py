@@ -6,9 +6,53 @@ and provide an appropriate response.
 
 from typing import Dict
 import os
+import functools
 from openai import AsyncOpenAI
+try:
+    import orjson
+except ImportError:
+    orjson = None
 import json
 
+# The system message and response format are the same for every request
+_SYSTEM_MSG = {"role": "system", "content": """شما یک دستیار هوشمند هستید که می‌تواند:
+    1. جستجو و مقایسه قیمت محصولات
+    2. تحلیل و بررسی محصولات
+    3. پیشنهاد محصولات مشابه
+    4. راهنمایی برای خرید
+    5. پاسخ به سوالات عمومی
+
+    لطفاً درخواست کاربر را تحلیل کنید و یک پاسخ JSON با این ساختار برگردانید:
+    {
+        "type": "product_search|product_analysis|recommendation|general_response",
+        "search_params": {"query": "...", "stores": [...], "filters": {...}},
+        "analysis": "متن تحلیل محصول",
+        "recommendations": ["پیشنهاد 1", "پیشنهاد 2", ...],
+        "response": "پاسخ عمومی"
+    }
+    فقط فیلدهای مرتبط با نوع درخواست را پر کنید."""}
+_RESPONSE_FORMAT = {"type": "json_object"}
+
+def _loads(text: str):
+    """Parse JSON with orjson when available, else the standard json module"""
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
+
+@functools.lru_cache(maxsize=1)
+def _get_client() -> AsyncOpenAI:
+    """
+    Return the shared OpenAI client, created on first use so repeated requests
+    reuse its connection pool
+
+    Raises:
+        ValueError: If OPENAI_API_KEY is not set (nothing is cached in that case)
+    """
+    api_key = os.getenv('OPENAI_API_KEY')
+    if not api_key:
+        raise ValueError("API key for OpenAI not found. Please set OPENAI_API_KEY in environment variables")
+    return AsyncOpenAI(api_key=api_key)
+
 async def analyze_user_request(user_prompt: str) -> Dict:
     """
     Analyzes user request and generates appropriate response using OpenAI
@@ -27,49 +71,25 @@ async def analyze_user_request(user_prompt: str) -> Dict:
     Raises:
         ValueError: If OPENAI_API_KEY is not set in environment variables
     """
-    # Check for API key in environment variables
-    api_key = os.getenv('OPENAI_API_KEY')
-    if not api_key:
-        raise ValueError("API key for OpenAI not found. Please set OPENAI_API_KEY in environment variables")
-    
-    # Create temporary OpenAI client
-    client = AsyncOpenAI(api_key=api_key)
+    # Shared OpenAI client (raises ValueError if the API key is missing)
+    client = _get_client()
     
     # Send request to OpenAI for analysis and decision making
-    system_prompt = """شما یک دستیار هوشمند هستید که می‌تواند:
-    1. جستجو و مقایسه قیمت محصولات
-    2. تحلیل و بررسی محصولات
-    3. پیشنهاد محصولات مشابه
-    4. راهنمایی برای خرید
-    5. پاسخ به سوالات عمومی
-
-    لطفاً درخواست کاربر را تحلیل کنید و یک پاسخ JSON با این ساختار برگردانید:
-    {
-        "type": "product_search|product_analysis|recommendation|general_response",
-        "search_params": {"query": "...", "stores": [...], "filters": {...}},
-        "analysis": "متن تحلیل محصول",
-        "recommendations": ["پیشنهاد 1", "پیشنهاد 2", ...],
-        "response": "پاسخ عمومی"
-    }
-    فقط فیلدهای مرتبط با نوع درخواست را پر کنید."""
-
     response = await client.chat.completions.create(
         model="gpt-3.5-turbo",
-        messages=[
-            {"role": "system", "content": system_prompt},
-            {"role": "user", "content": user_prompt}
-        ],
-        response_format={"type": "json_object"}
+        messages=[_SYSTEM_MSG, {"role": "user", "content": user_prompt}],
+        response_format=_RESPONSE_FORMAT
     )
     
     # Convert JSON response to dictionary
     try:
-        action_plan = json.loads(response.choices[0].message.content or "{}")
-    except json.JSONDecodeError:
+        action_plan = _loads(response.choices[0].message.content or "{}")
+    except ValueError:  # json.JSONDecodeError and orjson.JSONDecodeError
         # If JSON is not valid, return a generic response
         action_plan = {
             "type": "general_response",
             "response": "متأسفانه در پردازش درخواست شما مشکلی پیش آمد. لطفاً درخواست خود را به شکل دیگری مطرح کنید."
         }
     
-    return action_plan
\ No newline at end of file
+    return action_plan
+
@@ -4,16 +4,110 @@ Process and application management for Windows OS
 
 import os
 import sys
+import json
+import time
+import asyncio
+import threading
 import subprocess
 import winreg
-from typing import Optional, List, Dict
-import psutil
+from collections import deque
+from typing import Optional, List, Dict, Iterator, Tuple
 import win32com.client
 from pathlib import Path
+from .process_snapshot import get_processes_cached, invalidate
+
+_UNINSTALL_KEY = r"SOFTWARE\Microsoft\Windows\CurrentVersion\Uninstall"
+
+# Installed programs index, rebuilt when older than this (seconds)
+APPS_INDEX_TTL = 60.0
+
+# Start Menu / Program Files index, rebuilt when older than this (seconds)
+APP_PATHS_INDEX_MAX_AGE = 24 * 3600
+
+_APP_PATHS_INDEX_FILE = os.path.join(
+    os.environ.get('LOCALAPPDATA', os.path.expanduser('~')), 'agent', 'app_index.json'
+)
+
+_apps_index: Dict[str, Tuple[str, str]] = {}
+_apps_index_built_at: Optional[float] = None
+
+
+def _installed_apps_index() -> Dict[str, Tuple[str, str]]:
+    """
+    Map lowercased DisplayName -> (DisplayName, subkey name) for every
+    program under the Uninstall key, in registry order. Only DisplayName is
+    read per program; the result is reused for APPS_INDEX_TTL seconds.
+    """
+    global _apps_index, _apps_index_built_at
+    now = time.monotonic()
+    if _apps_index_built_at is not None and now - _apps_index_built_at < APPS_INDEX_TTL:
+        return _apps_index
+
+    index: Dict[str, Tuple[str, str]] = {}
+    with winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, _UNINSTALL_KEY,
+                        0, winreg.KEY_READ | winreg.KEY_WOW64_64KEY) as key:
+        for i in range(winreg.QueryInfoKey(key)[0]):
+            try:
+                subkey_name = winreg.EnumKey(key, i)
+                with winreg.OpenKey(key, subkey_name) as subkey:
+                    display_name = winreg.QueryValueEx(subkey, "DisplayName")[0]
+            except WindowsError:
+                continue
+            index.setdefault(display_name.lower(), (display_name, subkey_name))
+
+    _apps_index, _apps_index_built_at = index, now
+    return index
+
+def _iter_files(root: str) -> Iterator[os.DirEntry]:
+    """
+    Yield the files under root breadth-first (shallower files first).
+    Uses os.scandir, so no extra stat calls are made; unreadable
+    directories are skipped.
+    """
+    pending = deque([root])
+    while pending:
+        try:
+            with os.scandir(pending.popleft()) as it:
+                for entry in it:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            pending.append(entry.path)
+                        elif entry.is_file(follow_symlinks=False):
+                            yield entry
+                    except OSError:
+                        continue
+        except OSError:
+            continue
+
+def _load_app_paths_index() -> Optional[Dict[str, Dict[str, str]]]:
+    """Read the saved app paths index if it exists and is fresh enough"""
+    try:
+        with open(_APP_PATHS_INDEX_FILE, encoding='utf-8') as f:
+            data = json.load(f)
+        if time.time() - data['built_at'] < APP_PATHS_INDEX_MAX_AGE:
+            return {'shortcuts': data['shortcuts'], 'programs': data['programs']}
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+    return None
+
+def _save_app_paths_index(index: Dict[str, Dict[str, str]]) -> None:
+    try:
+        os.makedirs(os.path.dirname(_APP_PATHS_INDEX_FILE), exist_ok=True)
+        tmp = _APP_PATHS_INDEX_FILE + '.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump({'built_at': time.time(), **index}, f, ensure_ascii=False)
+        os.replace(tmp, _APP_PATHS_INDEX_FILE)
+    except OSError:
+        pass
 
 class ProcessManager:
     def __init__(self):
         self.shell = win32com.client.Dispatch("WScript.Shell")
+        # {'shortcuts': {lowercased .lnk name without extension: path},
+        #  'programs': {lowercased .exe name without extension: path}}
+        self._app_index: Optional[Dict[str, Dict[str, str]]] = None
+        self._app_index_thread: Optional[threading.Thread] = None
+        self._app_index_lock = threading.Lock()
         
     def start_application(self, app_name: str) -> bool:
         """
@@ -23,36 +117,135 @@ class ProcessManager:
         3. Program Files search
         """
         try:
-            # Try running directly if it's an exe name
-            if app_name.lower().endswith('.exe'):
-                subprocess.Popen(app_name)
-                return True
-                
-            # Try start menu shortcuts
-            start_menu = self._get_start_menu_path()
-            shortcuts = self._find_shortcuts(start_menu, app_name)
+            return self._launch(self._locate_application(app_name))
+        except Exception:
+            return False
+            
+    async def start_application_async(self, app_name: str) -> bool:
+        """
+        start_application for async callers: the Start Menu / Program Files
+        search runs on a worker thread so the event loop isn't blocked
+        """
+        try:
+            location = await asyncio.to_thread(self._locate_application, app_name)
+            # Launch on the calling thread, which owns the WScript.Shell COM object
+            return self._launch(location)
+        except Exception:
+            return False
+            
+    def _locate_application(self, app_name: str) -> Optional[Tuple[str, str]]:
+        """
+        Find how to start an application: ('exe', name), ('shortcut', path)
+        or ('program', path); None if it can't be found
+        """
+        # Try running directly if it's an exe name
+        if app_name.lower().endswith('.exe'):
+            return ('exe', app_name)
             
-            if shortcuts:
-                self.shell.Run(shortcuts[0])
-                return True
-                
+        # Use the Start Menu / Program Files index once it has been built
+        index = self._get_app_index()
+        if index is not None:
+            location = self._lookup_app_index(index, app_name.lower())
+            if location is not None:
+                return location
+            
+        # Try start menu shortcuts
+        start_menu = self._get_start_menu_path()
+        shortcuts = self._find_shortcuts(start_menu, app_name)
+        if shortcuts:
+            location = ('shortcut', shortcuts[0])
+        else:
             # Try Program Files
             program_files = self._find_in_program_files(app_name)
-            if program_files:
-                subprocess.Popen(program_files)
-                return True
-                
-            return False
+            location = ('program', program_files) if program_files else None
             
-        except Exception:
+        # Installed after the index was built: add it so the next lookup hits
+        if location is not None and index is not None:
+            self._add_to_app_index(app_name.lower(), location)
+        return location
+        
+    def _get_app_index(self) -> Optional[Dict[str, Dict[str, str]]]:
+        """
+        Return the app paths index, or None while it is still being built.
+        The first call loads the saved index or starts building it on a
+        background thread; callers fall back to searching the disk meanwhile.
+        """
+        if self._app_index is not None:
+            return self._app_index
+        with self._app_index_lock:
+            if self._app_index is None and self._app_index_thread is None:
+                self._app_index = _load_app_paths_index()
+                if self._app_index is None:
+                    self._app_index_thread = threading.Thread(
+                        target=self._build_app_index, name='app-index', daemon=True
+                    )
+                    self._app_index_thread.start()
+        return self._app_index
+        
+    def _build_app_index(self) -> None:
+        """Walk the Start Menu and Program Files once and save the result"""
+        shortcuts: Dict[str, str] = {}
+        for entry in _iter_files(self._get_start_menu_path()):
+            name = entry.name.lower()
+            if name.endswith('.lnk'):
+                shortcuts.setdefault(name[:-4], entry.path)
+        programs: Dict[str, str] = {}
+        for directory in (os.environ.get('ProgramFiles', 'C:/Program Files'),
+                          os.environ.get('ProgramFiles(x86)', 'C:/Program Files (x86)')):
+            for entry in _iter_files(directory):
+                name = entry.name.lower()
+                if name.endswith('.exe'):
+                    programs.setdefault(name[:-4], entry.path)
+        index = {'shortcuts': shortcuts, 'programs': programs}
+        _save_app_paths_index(index)
+        self._app_index = index
+        
+    def _add_to_app_index(self, app_lower: str, location: Tuple[str, str]) -> None:
+        """Record a location found on disk in the index and save it"""
+        kind, path = location
+        with self._app_index_lock:
+            if self._app_index is None:
+                return
+            if kind == 'shortcut':
+                self._app_index['shortcuts'][Path(path).stem.lower()] = path
+            else:
+                self._app_index['programs'][app_lower] = path
+            index = {'shortcuts': dict(self._app_index['shortcuts']),
+                     'programs': dict(self._app_index['programs'])}
+        _save_app_paths_index(index)
+        
+    @staticmethod
+    def _lookup_app_index(index: Dict[str, Dict[str, str]], app_lower: str) -> Optional[Tuple[str, str]]:
+        """Same precedence as the disk search: shortcut, then Program Files exe"""
+        path = index['shortcuts'].get(app_lower)
+        if path is None:
+            path = next((p for name, p in index['shortcuts'].items() if app_lower in name), None)
+        if path is not None:
+            return ('shortcut', path)
+        path = index['programs'].get(app_lower)
+        return ('program', path) if path is not None else None
+        
+    def _launch(self, location: Optional[Tuple[str, str]]) -> bool:
+        """Start an application found by _locate_application"""
+        if location is None:
             return False
+        kind, target = location
+        if kind == 'shortcut':
+            self.shell.Run(target)
+        else:
+            subprocess.Popen(target)
+        invalidate()
+        return True
             
     def stop_application(self, app_name: str) -> bool:
         """Stop a running application by name"""
         try:
-            for proc in psutil.process_iter(['name']):
-                if app_name.lower() in proc.info['name'].lower():
+            needle = app_name.casefold()
+            snapshot = get_processes_cached(attrs=('name',))
+            for name, proc in zip(snapshot.names, snapshot.procs):
+                if needle in name:
                     proc.terminate()
+                    invalidate()
                     return True
             return False
         except Exception:
@@ -60,13 +253,8 @@ class ProcessManager:
             
     def is_application_running(self, app_name: str) -> bool:
         """Check if an application is currently running"""
-        for proc in psutil.process_iter(['name']):
-            try:
-                if app_name.lower() in proc.info['name'].lower():
-                    return True
-            except (psutil.NoSuchProcess, psutil.AccessDenied):
-                pass
-        return False
+        needle = app_name.casefold()
+        return any(needle in name for name in get_processes_cached(attrs=('name',)).names)
         
     def _get_start_menu_path(self) -> str:
         """Get the path to Start Menu programs"""
@@ -74,11 +262,12 @@ class ProcessManager:
         
     def _find_shortcuts(self, start_dir: str, app_name: str) -> List[str]:
         """Find .lnk files matching the application name"""
+        app_lower = app_name.lower()
         shortcuts = []
-        for root, _, files in os.walk(start_dir):
-            for file in files:
-                if file.lower().endswith('.lnk') and app_name.lower() in file.lower():
-                    shortcuts.append(os.path.join(root, file))
+        for entry in _iter_files(start_dir):
+            name = entry.name.lower()
+            if name.endswith('.lnk') and app_lower in name:
+                shortcuts.append(entry.path)
         return shortcuts
         
     def _find_in_program_files(self, app_name: str) -> Optional[str]:
@@ -88,37 +277,38 @@ class ProcessManager:
             os.environ.get('ProgramFiles(x86)', 'C:/Program Files (x86)')
         ]
         
+        target = f"{app_name.lower()}.exe"
         for directory in search_dirs:
-            for root, _, files in os.walk(directory):
-                for file in files:
-                    if file.lower() == f"{app_name.lower()}.exe":
-                        return os.path.join(root, file)
+            for entry in _iter_files(directory):
+                if entry.name.lower() == target:
+                    return entry.path
         return None
         
+    async def get_application_info_async(self, app_name: str) -> Optional[Dict[str, str]]:
+        """get_application_info for async callers (registry reads run on a worker thread)"""
+        return await asyncio.to_thread(self.get_application_info, app_name)
+        
     def get_application_info(self, app_name: str) -> Optional[Dict[str, str]]:
         """Get information about an installed application"""
         try:
-            with winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, 
-                             r"SOFTWARE\Microsoft\Windows\CurrentVersion\Uninstall", 
+            app_lower = app_name.lower()
+            with winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, _UNINSTALL_KEY,
                              0, winreg.KEY_READ | winreg.KEY_WOW64_64KEY) as key:
-                for i in range(winreg.QueryInfoKey(key)[0]):
+                for name_lower, (display_name, subkey_name) in _installed_apps_index().items():
+                    if app_lower not in name_lower:
+                        continue
+                    # Only the matching entry's remaining values are read
                     try:
-                        subkey_name = winreg.EnumKey(key, i)
                         with winreg.OpenKey(key, subkey_name) as subkey:
-                            try:
-                                display_name = winreg.QueryValueEx(subkey, "DisplayName")[0]
-                                if app_name.lower() in display_name.lower():
-                                    return {
-                                        'name': display_name,
-                                        'version': winreg.QueryValueEx(subkey, "DisplayVersion")[0],
-                                        'publisher': winreg.QueryValueEx(subkey, "Publisher")[0],
-                                        'install_date': winreg.QueryValueEx(subkey, "InstallDate")[0],
-                                        'install_location': winreg.QueryValueEx(subkey, "InstallLocation")[0]
-                                    }
-                            except (WindowsError, KeyError):
-                                continue
-                    except WindowsError:
+                            return {
+                                'name': display_name,
+                                'version': winreg.QueryValueEx(subkey, "DisplayVersion")[0],
+                                'publisher': winreg.QueryValueEx(subkey, "Publisher")[0],
+                                'install_date': winreg.QueryValueEx(subkey, "InstallDate")[0],
+                                'install_location': winreg.QueryValueEx(subkey, "InstallLocation")[0]
+                            }
+                    except (WindowsError, KeyError):
                         continue
             return None
         except WindowsError:
-            return None
\ No newline at end of file
+            return None
@@ -0,0 +1,60 @@
+"""
+Shared, short-lived snapshot of the process table for Windows OS modules
+"""
+
+import time
+import threading
+from typing import Any, Dict, List, NamedTuple, Sequence, Tuple
+import psutil
+
+# Snapshots younger than this (seconds) are reused instead of rescanning
+SNAPSHOT_TTL = 0.25
+
+# Process attributes collected for every process in one scan by default.
+# process_iter reads them through Process.as_dict(), which runs inside
+# proc.oneshot(), so each process's attributes come from a single batch of
+# system calls. Callers that only match names pass attrs=('name',) instead.
+_ATTRS = ('pid', 'name', 'username', 'cpu_percent', 'memory_percent', 'memory_info')
+
+
+class ProcessSnapshot(NamedTuple):
+    """Parallel lists describing the processes found by one scan"""
+    processes: List[Dict[str, Any]]  # proc.info dicts (treat as read-only)
+    names: List[str]                 # casefolded process names
+    procs: List[psutil.Process]      # process handles (e.g. for terminate())
+
+
+# attrs tuple -> (snapshot, monotonic time it was taken)
+_snapshots: Dict[Tuple[str, ...], Tuple[ProcessSnapshot, float]] = {}
+_lock = threading.Lock()
+
+
+def get_processes_cached(max_age: float = SNAPSHOT_TTL,
+                         attrs: Sequence[str] = _ATTRS) -> ProcessSnapshot:
+    """
+    Return a process snapshot at most max_age seconds old whose processes
+    dicts hold at least attrs. A fresh snapshot taken with more attributes
+    is reused; otherwise only the requested attributes are collected.
+    """
+    wanted = set(attrs)
+    key = tuple(sorted(wanted | {'name'}))
+    with _lock:
+        now = time.monotonic()
+        for snap_attrs, (snapshot, taken_at) in _snapshots.items():
+            if now - taken_at < max_age and wanted.issubset(snap_attrs):
+                return snapshot
+        processes, names, procs = [], [], []
+        for proc in psutil.process_iter(list(key)):
+            info = proc.info
+            processes.append(info)
+            names.append((info.get('name') or '').casefold())
+            procs.append(proc)
+        snapshot = ProcessSnapshot(processes, names, procs)
+        _snapshots[key] = (snapshot, now)
+        return snapshot
+
+
+def invalidate() -> None:
+    """Force the next call to rescan (e.g. after starting or stopping a process)"""
+    with _lock:
+        _snapshots.clear()
@@ -12,6 +12,7 @@ import win32api
 import win32con
 import win32gui
 import win32process
+from .process_snapshot import get_processes_cached
 
 class WindowsController:
     @staticmethod
@@ -32,16 +33,14 @@ class WindowsController:
         Get list of running applications
         """
         apps = []
-        for proc in psutil.process_iter(['pid', 'name', 'cpu_percent', 'memory_info']):
-            try:
-                apps.append({
-                    'name': proc.info['name'],
-                    'pid': proc.info['pid'],
-                    'cpu': proc.info['cpu_percent'],
-                    'memory': proc.info['memory_info'].rss / 1024 / 1024  # MB
-                })
-            except (psutil.NoSuchProcess, psutil.AccessDenied):
-                pass
+        for info in get_processes_cached(attrs=('pid', 'name', 'cpu_percent', 'memory_info')).processes:
+            memory_info = info['memory_info']
+            apps.append({
+                'name': info['name'],
+                'pid': info['pid'],
+                'cpu': info['cpu_percent'],
+                'memory': memory_info.rss / 1024 / 1024 if memory_info else 0.0  # MB
+            })
         return apps
 
     @staticmethod
@@ -68,17 +67,19 @@ class WindowsController:
         """
         دریافت اطلاعات سیستم
         """
+        mem = psutil.virtual_memory()
+        disk = psutil.disk_usage('/')
         info = {
             'cpu_usage': psutil.cpu_percent(interval=1),
             'memory': {
-                'total': psutil.virtual_memory().total / (1024**3),  # GB
-                'used': psutil.virtual_memory().used / (1024**3),    # GB
-                'percent': psutil.virtual_memory().percent
+                'total': mem.total / (1024**3),  # GB
+                'used': mem.used / (1024**3),    # GB
+                'percent': mem.percent
             },
             'disk': {
-                'total': psutil.disk_usage('/').total / (1024**3),  # GB
-                'used': psutil.disk_usage('/').used / (1024**3),    # GB
-                'percent': psutil.disk_usage('/').percent
+                'total': disk.total / (1024**3),  # GB
+                'used': disk.used / (1024**3),    # GB
+                'percent': disk.percent
             }
         }
         return info
\ No newline at end of file
@@ -4,8 +4,64 @@ System monitoring functionality for Windows OS
 
 import psutil
 import wmi
+import sys
 import time
-from typing import Dict, List, Any, Tuple
+import queue
+import ctypes
+import asyncio
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Any, Optional, Tuple
+from .process_snapshot import get_processes_cached
+
+# Temperature readings are reused for this many seconds
+TEMPERATURE_TTL = 2.0
+
+# CPU usage readings are reused for this many seconds (non-blocking calls only)
+CPU_SAMPLE_MIN_INTERVAL = 0.5
+
+# Current CPU frequency readings are reused for this many seconds
+CPU_FREQ_TTL = 2.0
+
+# Disk usage readings are reused for this many seconds (per mountpoint)
+DISK_INFO_TTL = 2.0
+
+# The partition list is re-enumerated after this many seconds
+PARTITIONS_TTL = 30.0
+
+# Waitable timer flags/rights for poll_loop on Windows
+_CREATE_WAITABLE_TIMER_HIGH_RESOLUTION = 0x2
+_TIMER_ALL_ACCESS = 0x1F0003
+_INFINITE = 0xFFFFFFFF
+
+@functools.lru_cache(maxsize=1)
+def _timer_kernel32() -> "ctypes.WinDLL":
+    """
+    Private kernel32 handle with the waitable timer functions prototyped, so
+    HANDLE results aren't truncated to a C int on 64-bit Windows (the shared
+    ctypes.windll.kernel32 is left untouched)
+    """
+    from ctypes import wintypes
+    kernel32 = ctypes.WinDLL('kernel32', use_last_error=True)
+    kernel32.CreateWaitableTimerExW.restype = wintypes.HANDLE
+    kernel32.CreateWaitableTimerExW.argtypes = [
+        wintypes.LPVOID, wintypes.LPCWSTR, wintypes.DWORD, wintypes.DWORD
+    ]
+    kernel32.SetWaitableTimer.restype = wintypes.BOOL
+    kernel32.SetWaitableTimer.argtypes = [
+        wintypes.HANDLE, ctypes.POINTER(wintypes.LARGE_INTEGER), wintypes.LONG,
+        wintypes.LPVOID, wintypes.LPVOID, wintypes.BOOL
+    ]
+    kernel32.WaitForSingleObject.restype = wintypes.DWORD
+    kernel32.WaitForSingleObject.argtypes = [wintypes.HANDLE, wintypes.DWORD]
+    kernel32.CancelWaitableTimer.restype = wintypes.BOOL
+    kernel32.CancelWaitableTimer.argtypes = [wintypes.HANDLE]
+    kernel32.CloseHandle.restype = wintypes.BOOL
+    kernel32.CloseHandle.argtypes = [wintypes.HANDLE]
+    return kernel32
+
+_THERMAL_QUERY = "SELECT InstanceName, CurrentTemperature FROM MSAcpi_ThermalZoneTemperature"
 
 class SystemMonitor:
     def __init__(self):
@@ -13,21 +69,68 @@ class SystemMonitor:
             self.wmi = wmi.WMI()
         except Exception:
             self.wmi = None
+        # Thermal zone classes live in the root\wmi namespace; keep one connection to it
+        try:
+            self._wmi_thermal = wmi.WMI(namespace="root\\wmi")
+        except Exception:
+            self._wmi_thermal = None
+        # InstanceName -> result key, so the key strings are built once
+        self._zone_keys: Dict[str, str] = {}
+        # (time.monotonic() of the reading, temperatures)
+        self._temperature_cache: Optional[Tuple[float, Dict[str, float]]] = None
+        # Usable partitions and the time.monotonic() they were listed at
+        self._partitions_cache: List[Any] = []
+        self._partitions_ts: Optional[float] = None
+        # mountpoint -> (time.monotonic() of the reading, disk info)
+        self._disk_usage_cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+        # Worker threads for snapshot()
+        self._pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="sysmon")
+        self._last_cpu_sample_ts = 0.0
+        self._last_cpu_result: Optional[Dict[str, Any]] = None
+        # Prime psutil so the first non-blocking cpu_percent() calls have a
+        # baseline; process_iter reuses its Process objects, so the per-process
+        # baselines set by this scan carry over to later snapshots
+        psutil.cpu_percent(percpu=True)
+        try:
+            get_processes_cached(max_age=0)
+        except Exception:
+            pass
+        # Per-process cpu_percent is relative to one core (up to 100 * _ncpu)
+        self._ncpu = psutil.cpu_count() or 1
+        # min/max frequencies never change; only 'current' is re-read
+        try:
+            cpu_freq = psutil.cpu_freq(percpu=False)
+        except Exception:
+            cpu_freq = None
+        self._freq_min = cpu_freq.min if cpu_freq else 0.0
+        self._freq_max = cpu_freq.max if cpu_freq else 0.0
+        # (time.monotonic() of the reading, current frequency)
+        self._freq_cache: Optional[Tuple[float, float]] = None
         
-    def get_cpu_usage(self) -> Dict[str, Any]:
-        """Get detailed CPU usage statistics"""
+    def get_cpu_usage(self, interval: Optional[float] = None) -> Dict[str, Any]:
+        """Get detailed CPU usage statistics
+        
+        Args:
+            interval: Seconds to sample over. None (the default) returns usage
+                since the previous call without blocking; such readings are
+                reused for CPU_SAMPLE_MIN_INTERVAL seconds.
+        """
+        if interval is None:
+            now = time.monotonic()
+            if self._last_cpu_result is not None and now - self._last_cpu_sample_ts < CPU_SAMPLE_MIN_INTERVAL:
+                return dict(self._last_cpu_result)
         try:
-            cpu_percent = psutil.cpu_percent(interval=1, percpu=True)
-            cpu_freq = psutil.cpu_freq()
+            cpu_percent = psutil.cpu_percent(interval=interval, percpu=True)
             cpu_temp = self._get_cpu_temperature()
             
-            return {
-                'total_usage': psutil.cpu_percent(),
+            result = {
+                # Average of the per-core figures from the same sample
+                'total_usage': sum(cpu_percent) / len(cpu_percent) if cpu_percent else 0.0,
                 'per_core': cpu_percent,
                 'frequency': {
-                    'current': cpu_freq.current if cpu_freq else 0.0,
-                    'min': cpu_freq.min if cpu_freq else 0.0,
-                    'max': cpu_freq.max if cpu_freq else 0.0
+                    'current': self._get_cpu_frequency(),
+                    'min': self._freq_min,
+                    'max': self._freq_max
                 },
                 'temperature': cpu_temp
             }
@@ -38,6 +141,10 @@ class SystemMonitor:
                 'frequency': {'current': 0.0, 'min': 0.0, 'max': 0.0},
                 'temperature': {}
             }
+        if interval is None:
+            self._last_cpu_sample_ts, self._last_cpu_result = now, result
+            return dict(result)
+        return result
         
     def get_memory_info(self) -> Dict[str, Any]:
         """Get RAM usage statistics"""
@@ -58,58 +165,160 @@ class SystemMonitor:
         }
         
     def get_disk_info(self) -> List[Dict[str, Any]]:
-        """Get disk usage information for all drives"""
+        """Get disk usage information for all drives
+        
+        The partition list is cached for PARTITIONS_TTL seconds and each
+        drive's usage for DISK_INFO_TTL seconds.
+        """
+        now = time.monotonic()
+        if self._partitions_ts is None or now - self._partitions_ts > PARTITIONS_TTL:
+            # Empty optical drives and unformatted/disconnected volumes can stall disk_usage
+            self._partitions_cache = [
+                partition for partition in psutil.disk_partitions(all=False)
+                if 'cdrom' not in partition.opts and partition.fstype
+            ]
+            self._partitions_ts = now
+            mountpoints = {partition.mountpoint for partition in self._partitions_cache}
+            for mountpoint in list(self._disk_usage_cache):
+                if mountpoint not in mountpoints:
+                    del self._disk_usage_cache[mountpoint]
+        
         disks = []
-        for partition in psutil.disk_partitions():
+        for partition in self._partitions_cache:
+            cached = self._disk_usage_cache.get(partition.mountpoint)
+            if cached is not None and now - cached[0] < DISK_INFO_TTL:
+                disks.append(dict(cached[1]))
+                continue
             try:
                 usage = psutil.disk_usage(partition.mountpoint)
-                disks.append({
-                    'device': partition.device,
-                    'mountpoint': partition.mountpoint,
-                    'fstype': partition.fstype,
-                    'total': usage.total,
-                    'used': usage.used,
-                    'free': usage.free,
-                    'percent': usage.percent
-                })
             except Exception:
                 continue
+            disk = {
+                'device': partition.device,
+                'mountpoint': partition.mountpoint,
+                'fstype': partition.fstype,
+                'total': usage.total,
+                'used': usage.used,
+                'free': usage.free,
+                'percent': usage.percent
+            }
+            self._disk_usage_cache[partition.mountpoint] = (now, disk)
+            disks.append(dict(disk))
         return disks
         
     def get_running_processes(self) -> List[Dict[str, Any]]:
         """Get list of running processes with resource usage"""
         processes = []
         try:
-            for proc in psutil.process_iter(['pid', 'name', 'username', 'cpu_percent', 'memory_percent']):
-                try:
-                    pinfo = proc.info
-                    # Avoid potential division by zero or invalid memory calculations
-                    try:
-                        pinfo['cpu_percent'] = proc.cpu_percent()
-                    except Exception:
-                        pinfo['cpu_percent'] = 0.0
-                        
-                    try:
-                        pinfo['memory_percent'] = proc.memory_percent()
-                    except Exception:
-                        pinfo['memory_percent'] = 0.0
-                        
-                    processes.append(pinfo)
-                except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
-                    continue
+            for info in get_processes_cached().processes:
+                processes.append({
+                    'pid': info['pid'],
+                    'name': info['name'],
+                    'username': info['username'],
+                    # Missing values (e.g. access denied) are reported as 0.0
+                    'cpu_percent': info['cpu_percent'] or 0.0,
+                    'memory_percent': info['memory_percent'] or 0.0,
+                })
         except Exception:
             # Return empty list if process iteration fails completely
             return []
         return processes
         
+    def snapshot(self) -> Dict[str, Any]:
+        """Collect CPU, memory, disk and process information concurrently
+        
+        Returns a dict with 'cpu', 'mem', 'disk' and 'proc' keys. The CPU
+        reading (which may query WMI) runs on the calling thread, since the
+        WMI connections belong to the thread that created the monitor.
+        """
+        futures = {
+            key: self._pool.submit(fn) for key, fn in (
+                ("mem", self.get_memory_info),
+                ("disk", self.get_disk_info),
+                ("proc", self.get_running_processes),
+            )
+        }
+        result = {"cpu": self.get_cpu_usage()}
+        result.update((key, future.result()) for key, future in futures.items())
+        return result
+        
+    def poll_loop(self, hz: float, sink_queue: "queue.Queue[Dict[str, Any]]",
+                  stop_event: Optional[threading.Event] = None) -> None:
+        """Push a snapshot() into sink_queue hz times per second until stop_event is set
+        
+        Blocks the calling thread, which should be the thread that created the
+        monitor. Ticks are paced by a kernel waitable timer on Windows (by
+        monotonic deadlines elsewhere), so they don't drift with the time
+        each snapshot takes. The loop only collects readings; writing them
+        to disk or a log belongs on a separate thread consuming sink_queue.
+        """
+        stop_event = stop_event or threading.Event()
+        period = 1.0 / hz
+        if sys.platform == 'win32':
+            from ctypes import wintypes
+            kernel32 = _timer_kernel32()
+            timer = kernel32.CreateWaitableTimerExW(
+                None, None, _CREATE_WAITABLE_TIMER_HIGH_RESOLUTION, _TIMER_ALL_ACCESS
+            )
+            if not timer:
+                # High-resolution timers need Windows 10 1803+
+                timer = kernel32.CreateWaitableTimerExW(None, None, 0, _TIMER_ALL_ACCESS)
+            if not timer:
+                raise ctypes.WinError(ctypes.get_last_error())
+            try:
+                # Negative due time is relative, in 100 ns units; period is in ms
+                due = wintypes.LARGE_INTEGER(-int(10_000_000 * period))
+                if not kernel32.SetWaitableTimer(timer, ctypes.byref(due),
+                                                 max(1, int(1000 * period)),
+                                                 None, None, False):
+                    raise ctypes.WinError(ctypes.get_last_error())
+                while not stop_event.is_set():
+                    sink_queue.put(self.snapshot())
+                    kernel32.WaitForSingleObject(timer, _INFINITE)
+            finally:
+                kernel32.CancelWaitableTimer(timer)
+                kernel32.CloseHandle(timer)
+            return
+        
+        deadline = time.monotonic()
+        while not stop_event.is_set():
+            sink_queue.put(self.snapshot())
+            deadline += period
+            delay = deadline - time.monotonic()
+            if delay > 0:
+                stop_event.wait(delay)
+            else:
+                # Fell behind; skip missed ticks instead of bursting
+                deadline = time.monotonic()
+        
+    def _get_cpu_frequency(self) -> float:
+        """Get the current aggregate CPU frequency (cached for CPU_FREQ_TTL seconds)"""
+        now = time.monotonic()
+        if self._freq_cache is not None and now - self._freq_cache[0] < CPU_FREQ_TTL:
+            return self._freq_cache[1]
+        cpu_freq = psutil.cpu_freq(percpu=False)
+        current = cpu_freq.current if cpu_freq else 0.0
+        self._freq_cache = (now, current)
+        return current
+        
     def _get_cpu_temperature(self) -> Dict[str, float]:
-        """Get CPU temperature information"""
-        if not self.wmi:
+        """Get CPU temperature information (cached for TEMPERATURE_TTL seconds)"""
+        if not self._wmi_thermal:
             return {}
-            
+        
+        now = time.monotonic()
+        if self._temperature_cache is not None and now - self._temperature_cache[0] < TEMPERATURE_TTL:
+            return dict(self._temperature_cache[1])
+        temperatures = self._query_cpu_temperature()
+        self._temperature_cache = (now, temperatures)
+        return dict(temperatures)
+        
+    def _query_cpu_temperature(self) -> Dict[str, float]:
+        """Query thermal zone temperatures from WMI"""
         try:
             temperatures = {}
-            temp_query = self.wmi.MSAcpi_ThermalZoneTemperature()
+            # wmi runs the query forward-only and returning immediately
+            temp_query = self._wmi_thermal.query(_THERMAL_QUERY)
             
             if not temp_query:
                 return {}
@@ -118,10 +327,45 @@ class SystemMonitor:
                 try:
                     # Convert tenths of Kelvin to Celsius
                     temp_celsius = (item.CurrentTemperature / 10.0) - 273.15
-                    temperatures[f'zone_{item.InstanceName}'] = temp_celsius
+                    name = item.InstanceName
+                    key = self._zone_keys.get(name)
+                    if key is None:
+                        key = self._zone_keys[name] = f'zone_{name}'
+                    temperatures[key] = temp_celsius
                 except (AttributeError, TypeError, ZeroDivisionError):
                     continue
                     
             return temperatures
         except Exception:
-            return {}
\ No newline at end of file
+            return {}
+
+
+# WMI COM objects belong to the thread that created them, so the shared
+# monitor is created on, and used from, one dedicated COM thread
+_com_thread = threading.local()
+
+def _init_com_thread() -> None:
+    _com_thread.active = True
+    try:
+        import pythoncom
+        pythoncom.CoInitialize()
+    except ImportError:
+        pass
+
+_COM_EXECUTOR = ThreadPoolExecutor(max_workers=1, thread_name_prefix='wmi',
+                                   initializer=_init_com_thread)
+
+@functools.lru_cache(maxsize=1)
+def get_monitor() -> SystemMonitor:
+    """Process-wide SystemMonitor (WMI connection opened once, on the COM thread)"""
+    if getattr(_com_thread, 'active', False):
+        return SystemMonitor()
+    return _COM_EXECUTOR.submit(SystemMonitor).result()
+
+async def call_monitor(method: str, *args: Any) -> Any:
+    """Run a method of the shared monitor on the COM thread without blocking the event loop
+    
+    Example: ``await call_monitor('get_cpu_usage')``
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_COM_EXECUTOR, lambda: getattr(get_monitor(), method)(*args))
@@ -2,17 +2,54 @@
 Web browser automation and interaction for Sofware-AI
 """
 
+import time
 import asyncio
-from typing import Dict, List, Optional, Any
+from collections import defaultdict, deque
+from functools import lru_cache
+from statistics import fmean
+from typing import Deque, Dict, List, Optional, Any, Tuple
 from playwright.async_api import async_playwright, Browser, Page
 import json
 import re
 from urllib.parse import quote_plus
 
+# Resources the scrapers never need; requests for them are aborted
+_BLOCKED_RESOURCES = "**/*.{png,jpg,jpeg,gif,webp,svg,woff,woff2,css}"
+
+# Pooled pages unused for this many seconds are closed
+PAGE_IDLE_TTL = 30.0
+
+_WS_RE = re.compile(r'\s+')
+_PUNCT_RE = re.compile(r'[^\w\s]')
+_NONDIGIT_RE = re.compile(r'[^\d]')
+
+# Reads the product boxes as parallel arrays (one array per field)
+_SCRAPE_JS = """
+    (boxes, sel) => ({
+        titles: boxes.map(b => b.querySelector(sel.title)?.innerText ?? null),
+        prices: boxes.map(b => b.querySelector(sel.price)?.innerText ?? null),
+        links: boxes.map(b => b.querySelector('a')?.href ?? null),
+        images: boxes.map(b => b.querySelector('img')?.src ?? null),
+    })
+"""
+
+
+@lru_cache(maxsize=1024)
+def _parse_price(price_str: str) -> float:
+    """Numeric value of a price string (0 if it has no digits)"""
+    # Remove non-numeric characters and convert to float
+    price = _NONDIGIT_RE.sub('', price_str)
+    return float(price) if price else 0
+
 class WebAutomation:
     def __init__(self):
         self._browser: Optional[Browser] = None
         self._context = None
+        # Keeps concurrent searches from launching a browser each
+        self._init_lock = asyncio.Lock()
+        # site -> (page, time.monotonic() it was released), oldest first
+        self._page_pool: Dict[str, Deque[Tuple[Page, float]]] = {}
+        self._page_reaper: Optional[asyncio.Task] = None
         
     async def __aenter__(self):
         await self.initialize()
@@ -27,6 +64,7 @@ class WebAutomation:
             playwright = await async_playwright().start()
             self._browser = await playwright.chromium.launch(headless=True)
             self._context = await self._browser.new_context()
+            await self._context.route(_BLOCKED_RESOURCES, lambda route: route.abort())
         except Exception as e:
             self._browser = None
             self._context = None
@@ -34,6 +72,11 @@ class WebAutomation:
         
     async def cleanup(self):
         """Clean up browser resources"""
+        if self._page_reaper:
+            self._page_reaper.cancel()
+            self._page_reaper = None
+        # Pooled pages are closed along with their context
+        self._page_pool.clear()
         if self._context:
             await self._context.close()
         if self._browser:
@@ -43,14 +86,15 @@ class WebAutomation:
         """Search for product information across multiple sources"""
         results = []
         
-        # Search major Iranian e-commerce sites
-        digikala_results = await self._search_digikala(query)
-        if digikala_results:
-            results.extend(digikala_results)
-            
-        technolife_results = await self._search_technolife(query)
-        if technolife_results:
-            results.extend(technolife_results)
+        # Search major Iranian e-commerce sites (concurrently, one page each)
+        site_results = await asyncio.gather(
+            self._search_digikala(query),
+            self._search_technolife(query),
+            return_exceptions=True,
+        )
+        for site_result in site_results:
+            if site_result and not isinstance(site_result, BaseException):
+                results.extend(site_result)
             
         # Add price comparison
         if results:
@@ -58,38 +102,68 @@ class WebAutomation:
             
         return results
         
+    async def _ensure_context(self):
+        """Initialize the browser on first use (once, even with concurrent callers)"""
+        async with self._init_lock:
+            if not self._context:
+                await self.initialize()
+            
+    async def _acquire_page(self, site: str) -> Page:
+        """Take the most recently used pooled page for site, or open a new one"""
+        pool = self._page_pool.get(site)
+        while pool:
+            page, _ = pool.pop()
+            if not page.is_closed():
+                return page
+        return await self._context.new_page()
+        
+    async def _release_page(self, site: str, page: Page):
+        """Blank the page and return it to site's pool"""
+        try:
+            await page.goto('about:blank')
+        except Exception:
+            await page.close()
+            return
+        self._page_pool.setdefault(site, deque()).append((page, time.monotonic()))
+        if self._page_reaper is None or self._page_reaper.done():
+            self._page_reaper = asyncio.create_task(self._reap_idle_pages())
+            
+    async def _reap_idle_pages(self):
+        """Close pooled pages idle for PAGE_IDLE_TTL seconds; exits once the pools are empty"""
+        while any(self._page_pool.values()):
+            await asyncio.sleep(PAGE_IDLE_TTL)
+            cutoff = time.monotonic() - PAGE_IDLE_TTL
+            for pool in list(self._page_pool.values()):
+                while pool and pool[0][1] <= cutoff:
+                    page, _ = pool.popleft()
+                    try:
+                        await page.close()
+                    except Exception:
+                        pass
+            
     async def _search_digikala(self, query: str) -> List[Dict[str, Any]]:
         """Search Digikala for products"""
         page = None
         try:
-            if not self._context:
-                await self.initialize()
+            await self._ensure_context()
             if not self._context:
                 raise Exception("Failed to initialize browser context")
-            page = await self._context.new_page()
-            await page.goto(f"https://www.digikala.com/search/?q={quote_plus(query)}")
+            page = await self._acquire_page('digikala')
+            await page.goto(f"https://www.digikala.com/search/?q={quote_plus(query)}",
+                            wait_until="domcontentloaded")
             await page.wait_for_selector(".c-product-box")
             
-            products = await page.evaluate("""
-                () => {
-                    const products = [];
-                    document.querySelectorAll('.c-product-box').forEach(box => {
-                        const title = box.querySelector('.c-product-box__title')?.innerText;
-                        const price = box.querySelector('.c-price__value')?.innerText;
-                        const link = box.querySelector('a')?.href;
-                        const image = box.querySelector('img')?.src;
-                        if (title && price) {
-                            products.push({ title, price, link, image, source: 'digikala' });
-                        }
-                    });
-                    return products;
-                }
-            """)
+            products = await self._scrape_products(
+                page, '.c-product-box', '.c-product-box__title', '.c-price__value', 'digikala'
+            )
             
+            await self._release_page('digikala', page)
+            page = None
             return products
         except Exception as e:
             return []
         finally:
+            # A page that failed mid-search is not reused
             if page:
                 await page.close()
             
@@ -97,57 +171,60 @@ class WebAutomation:
         """Search Technolife for products"""
         page = None
         try:
-            if not self._context:
-                await self.initialize()
+            await self._ensure_context()
             if not self._context:
                 raise Exception("Failed to initialize browser context")
-            page = await self._context.new_page()
-            await page.goto(f"https://www.technolife.ir/search?query={quote_plus(query)}")
+            page = await self._acquire_page('technolife')
+            await page.goto(f"https://www.technolife.ir/search?query={quote_plus(query)}",
+                            wait_until="domcontentloaded")
             await page.wait_for_selector(".product-box")
             
-            products = await page.evaluate("""
-                () => {
-                    const products = [];
-                    document.querySelectorAll('.product-box').forEach(box => {
-                        const title = box.querySelector('.product-title')?.innerText;
-                        const price = box.querySelector('.price')?.innerText;
-                        const link = box.querySelector('a')?.href;
-                        const image = box.querySelector('img')?.src;
-                        if (title && price) {
-                            products.push({ title, price, link, image, source: 'technolife' });
-                        }
-                    });
-                    return products;
-                }
-            """)
+            products = await self._scrape_products(
+                page, '.product-box', '.product-title', '.price', 'technolife'
+            )
             
-            await page.close()
+            await self._release_page('technolife', page)
+            page = None
             return products
         except Exception:
             return []
+        finally:
+            if page:
+                await page.close()
+            
+    async def _scrape_products(self, page: Page, box_selector: str, title_selector: str,
+                               price_selector: str, source: str) -> List[Dict[str, Any]]:
+        """Read the product boxes on page; boxes without a title or price are skipped"""
+        data = await page.locator(box_selector).evaluate_all(
+            _SCRAPE_JS, {'title': title_selector, 'price': price_selector}
+        )
+        return [
+            {'title': title, 'price': price, 'link': link, 'image': image, 'source': source}
+            for title, price, link, image in zip(data['titles'], data['prices'], data['links'], data['images'])
+            if title and price
+        ]
             
     async def _enrich_with_price_comparison(self, products: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Add price comparison data to products"""
         # Group similar products
-        product_groups = {}
+        product_groups = defaultdict(list)
         for product in products:
-            normalized_title = self._normalize_product_name(product['title'])
-            if normalized_title not in product_groups:
-                product_groups[normalized_title] = []
-            product_groups[normalized_title].append(product)
+            product_groups[self._normalize_product_name(product['title'])].append(product)
             
         # Add comparison data
         enriched_products = []
         for group in product_groups.values():
             if len(group) > 1:
-                prices = [self._extract_price(p['price']) for p in group if self._extract_price(p['price']) > 0]
+                # Parse each product's price once
+                numeric_prices = [self._extract_price(p['price']) for p in group]
+                prices = [price for price in numeric_prices if price > 0]
                 if prices:
-                    avg_price = sum(prices) / len(prices)
-                    for product in group:
+                    avg_price = fmean(prices)
+                    for product, price in zip(group, numeric_prices):
                         product['price_comparison'] = {
                             'average': avg_price,
-                            'difference_percent': ((self._extract_price(product['price']) - avg_price) / avg_price) * 100
-                            if self._extract_price(product['price']) > 0 else None
+                            'difference_percent': ((price - avg_price) / avg_price) * 100
+                            if price > 0 else None
                         }
             enriched_products.extend(group)
             
@@ -156,15 +233,13 @@ class WebAutomation:
     def _normalize_product_name(self, name: str) -> str:
         """Normalize product name for comparison"""
         # Remove common variations and extra spaces
-        name = re.sub(r'\s+', ' ', name.lower())
-        name = re.sub(r'[^\w\s]', '', name)
+        name = _WS_RE.sub(' ', name.lower())
+        name = _PUNCT_RE.sub('', name)
         return name.strip()
         
     def _extract_price(self, price_str: str) -> float:
         """Extract numeric price from string"""
         try:
-            # Remove non-numeric characters and convert to float
-            price = re.sub(r'[^\d]', '', price_str)
-            return float(price) if price else 0
+            return _parse_price(price_str)
         except ValueError:
             return 0
\ No newline at end of file
@@ -16,7 +16,7 @@ import asyncio
 from typing import Optional
 
 from utils.logger import logger
-from agent.ai.factory import AIFactory
+from utils import event_loop
 
 
 def load_dotenv_if_present() -> None:
@@ -26,6 +26,9 @@ def load_dotenv_if_present() -> None:
 		logger.info("Loaded .env file (if present)")
 	except Exception:
 		logger.debug("python-dotenv not available or .env missing; skipping load")
+	# Checked on the environment instead of re-reading the file
+	if not (os.getenv("GOOGLE_API_KEY") or os.getenv("OPENAI_API_KEY")):
+		logger.warning("No API key (GOOGLE_API_KEY / OPENAI_API_KEY) set after loading .env")
 
 
 async def run_cli() -> int:
@@ -56,16 +59,34 @@ def run_gui(argv: Optional[list] = None) -> int:
 
 	try:
 		from ui.main_window import MainWindow
+		from agent.ai.factory import AIFactory
 	except Exception as e:
 		logger.exception("Failed to import UI components: %s", e)
 		raise
 
 	app = QApplication(argv)
+	try:
+		import qasync
+	except ImportError:
+		qasync = None
+	if qasync is not None:
+		# With qasync, Qt and asyncio share one event loop, so coroutines
+		# (e.g. agent requests) can be awaited straight from the GUI.
+		# Installed before the window is built so the window can find it.
+		loop = qasync.QEventLoop(app)
+		asyncio.set_event_loop(loop)
+
 	factory = AIFactory()
 	window = MainWindow(factory)
 	window.show()
-	# Return the Qt application exit code
-	return app.exec()
+
+	if qasync is None:
+		# Return the Qt application exit code
+		return app.exec()
+
+	with loop:
+		# Runs app.exec() on the shared loop and returns its exit code
+		return loop.run_forever()
 
 
 def parse_args(argv: Optional[list] = None) -> argparse.Namespace:
@@ -73,6 +94,7 @@ def parse_args(argv: Optional[list] = None) -> argparse.Namespace:
 	p.add_argument("--cli", action="store_true", help="Run in console CLI mode")
 	p.add_argument("--no-gui", action="store_true", help="Do not attempt to start GUI")
 	p.add_argument("--debug", action="store_true", help="Enable debug logging")
+	p.add_argument("--profile", metavar="FILE", help="Write cProfile stats for the run to FILE")
 	return p.parse_args(argv)
 
 
@@ -83,12 +105,27 @@ def main(argv: Optional[list] = None) -> int:
 	if args.debug:
 		logger.setLevel("DEBUG")
 
+	if args.profile:
+		import cProfile
+		profiler = cProfile.Profile()
+		profiler.enable()
+		try:
+			return start(args, argv)
+		finally:
+			profiler.disable()
+			profiler.dump_stats(args.profile)
+			logger.info("Profile written to %s", args.profile)
+	return start(args, argv)
+
+
+def start(args: argparse.Namespace, argv: list) -> int:
+	"""Load the environment and run the selected mode. Returns exit code."""
 	load_dotenv_if_present()
 
 	# If user explicitly requested CLI, run it
 	if args.cli or args.no_gui:
 		logger.info("Starting in CLI mode")
-		return asyncio.run(run_cli())
+		return event_loop.run(run_cli())
 
 	# Prefer GUI when available, otherwise fall back to CLI
 	try:
@@ -96,7 +133,7 @@ def main(argv: Optional[list] = None) -> int:
 		return run_gui([sys.argv[0]] + list(argv))
 	except Exception as e:
 		logger.warning("GUI unavailable or failed to start (%s). Falling back to CLI.", e)
-		return asyncio.run(run_cli())
+		return event_loop.run(run_cli())
 
 
 if __name__ == "__main__":
@@ -0,0 +1,226 @@
+"""
+Chat history model and message delegate for the main window.
+Messages live in a list model shown by a QListView, so only the rows in
+view are laid out and painted however long the conversation grows.
+"""
+
+import os
+import sys
+import json
+import functools
+from collections import OrderedDict, deque
+from typing import Any, Deque, Dict, Iterable, List, Optional, Tuple
+from PySide6.QtCore import Qt, QAbstractListModel, QModelIndex, QPointF, QRect, QRectF, QSize
+from PySide6.QtGui import QColor, QFont, QFontMetrics, QPainter, QStaticText, QTextOption, QTransform
+from PySide6.QtWidgets import QStyledItemDelegate, QStyleOptionViewItem
+
+# Most messages kept in memory (and in the view) by a ChatModel
+MAX_MESSAGES = 500
+
+# Most laid-out texts kept by a ChatDelegate
+LAYOUT_CACHE_SIZE = 2048
+
+# Most measured text heights kept by a ChatDelegate (sizeHint runs for
+# every row when the view lays out, not just for visible ones)
+HEIGHT_CACHE_SIZE = 16384
+
+# Custom item data role holding the message sender
+SenderRole = Qt.ItemDataRole.UserRole + 1
+
+
+class ChatModel(QAbstractListModel):
+    """List model over the most recent max_messages of the chat history
+
+    Senders and texts are kept in two parallel deques (no per-message
+    object); sender names are interned, as there are only a few of them.
+    Older messages are dropped from the model and, if history_log is
+    given, appended to that file as JSON lines.
+    """
+
+    def __init__(self, parent=None, max_messages: int = MAX_MESSAGES,
+                 history_log: Optional[str] = None):
+        super().__init__(parent)
+        self.max_messages = max_messages
+        self.history_log = history_log
+        self._log_file = None
+        self._senders: Deque[str] = deque()
+        self._texts: Deque[str] = deque()
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._texts)
+
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole) -> Any:
+        if not index.isValid():
+            return None
+        if role == Qt.ItemDataRole.DisplayRole:
+            return self._texts[index.row()]
+        if role == SenderRole:
+            return self._senders[index.row()]
+        return None
+
+    def append_message(self, sender: str, message: str) -> None:
+        """Append a message at the end of the history"""
+        self.append_messages([(sender, message)])
+
+    def append_messages(self, messages: List[Tuple[str, str]]) -> None:
+        """Append several (sender, message) pairs with a single row insertion"""
+        if not messages:
+            return
+        if len(messages) > self.max_messages:
+            self._log_trimmed(messages[:-self.max_messages])
+            messages = messages[-self.max_messages:]
+        overflow = len(self._texts) + len(messages) - self.max_messages
+        if overflow > 0:
+            self.beginRemoveRows(QModelIndex(), 0, overflow - 1)
+            trimmed = [(self._senders.popleft(), self._texts.popleft()) for _ in range(overflow)]
+            self.endRemoveRows()
+            self._log_trimmed(trimmed)
+        first = len(self._texts)
+        self.beginInsertRows(QModelIndex(), first, first + len(messages) - 1)
+        self._senders.extend(sys.intern(sender) for sender, _ in messages)
+        self._texts.extend(message for _, message in messages)
+        self.endInsertRows()
+
+    def messages(self) -> Iterable[Tuple[str, str]]:
+        """The in-memory history as (sender, message) pairs"""
+        return zip(self._senders, self._texts)
+
+    def _log_trimmed(self, messages: List[Tuple[str, str]]) -> None:
+        """Append messages dropped from memory to history_log"""
+        if not self.history_log:
+            return
+        try:
+            if self._log_file is None:
+                os.makedirs(os.path.dirname(os.path.abspath(self.history_log)), exist_ok=True)
+                self._log_file = open(self.history_log, "a", encoding="utf-8")
+            self._log_file.writelines(
+                json.dumps({"sender": sender, "message": message}, ensure_ascii=False) + "\n"
+                for sender, message in messages
+            )
+            self._log_file.flush()
+        except OSError:
+            pass
+
+
+class ChatDelegate(QStyledItemDelegate):
+    """Paints each message as a rounded bubble with the sender above the text"""
+
+    MARGIN_H = 16   # Bubble margin to the view edges
+    MARGIN_V = 4    # Half the gap between bubbles
+    PADDING = 12    # Bubble padding around its contents
+    SPACING = 4     # Gap between sender and message text
+
+    BUBBLE_COLOR = QColor("#ffffff")
+    # Bubble colours for the user's and the system's messages (painted here,
+    # not styled: styles.py has no per-message rules)
+    SENDER_BUBBLE_COLORS = {
+        "شما": QColor("#e8f0fe"),
+        "سیستم": QColor("#f8f9fa"),
+    }
+    BORDER_COLOR = QColor("#e0e0e0")
+    SENDER_COLOR = QColor("#202124")
+    TEXT_COLOR = QColor("#3c4043")
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        # Right-aligned, word-wrapped text for Persian messages
+        self._text_option = QTextOption(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignAbsolute)
+        self._text_option.setWrapMode(QTextOption.WrapMode.WordWrap)
+        self._fonts: Dict[str, QFont] = {}
+        self._metrics: Dict[str, QFontMetrics] = {}
+        # Laid-out texts by (text, font key, width), least recently painted
+        # first, so repaints reuse prepared glyph runs. Only layouts for the
+        # current width are kept.
+        self._static_cache: "OrderedDict[Tuple[str, str, int], QStaticText]" = OrderedDict()
+        self._static_width = 0
+        # Text heights by (text, font key, width), measured with one shared
+        # QFontMetrics per font so rows out of view never get a prepared layout
+        self._height = functools.lru_cache(maxsize=HEIGHT_CACHE_SIZE)(self._measure_text)
+
+    def _sender_font(self, font: QFont) -> QFont:
+        sender_font = QFont(font)
+        sender_font.setPixelSize(13)
+        sender_font.setWeight(QFont.Weight.DemiBold)
+        return sender_font
+
+    def _font_key(self, font: QFont) -> str:
+        font_key = font.key()
+        if font_key not in self._fonts:
+            self._fonts[font_key] = QFont(font)
+            self._metrics[font_key] = QFontMetrics(font)
+        return font_key
+
+    def _static_text(self, text: str, font: QFont, width: int) -> QStaticText:
+        """Lay out text wrapped to width (cached)"""
+        if width != self._static_width:
+            # The view was resized; layouts for the old width won't be drawn again
+            self._static_cache.clear()
+            self._static_width = width
+        key = (text, self._font_key(font), width)
+        static = self._static_cache.get(key)
+        if static is not None:
+            self._static_cache.move_to_end(key)
+            return static
+        static = self._layout_text(*key)
+        self._static_cache[key] = static
+        if len(self._static_cache) > LAYOUT_CACHE_SIZE:
+            self._static_cache.popitem(last=False)
+        return static
+
+    def _text_height(self, text: str, font: QFont, width: int) -> float:
+        """Height of text wrapped to width (cached)"""
+        return self._height(text, self._font_key(font), width)
+
+    def _measure_text(self, text: str, font_key: str, width: int) -> float:
+        rect = QRect(0, 0, width, 0)
+        return self._metrics[font_key].boundingRect(rect, Qt.TextFlag.TextWordWrap, text).height()
+
+    def _layout_text(self, text: str, font_key: str, width: int) -> QStaticText:
+        font = self._fonts[font_key]
+        static = QStaticText(text)
+        static.setTextFormat(Qt.TextFormat.PlainText)
+        static.setTextOption(self._text_option)
+        static.setTextWidth(width)
+        # Keep the rendered glyphs too, not only the layout
+        static.setPerformanceHint(QStaticText.PerformanceHint.AggressiveCaching)
+        static.prepare(QTransform(), font)
+        return static
+
+    def _content_width(self, option: QStyleOptionViewItem) -> int:
+        """Width available to the text inside a bubble"""
+        view = option.widget
+        width = view.viewport().width() if view is not None else option.rect.width()
+        return max(1, width - 2 * (self.MARGIN_H + self.PADDING))
+
+    def paint(self, painter: QPainter, option: QStyleOptionViewItem, index: QModelIndex) -> None:
+        width = self._content_width(option)
+        sender_font = self._sender_font(option.font)
+        sender = self._static_text(index.data(SenderRole), sender_font, width)
+        body = self._static_text(index.data(), option.font, width)
+
+        painter.save()
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        bubble = QRectF(option.rect).adjusted(
+            self.MARGIN_H + 0.5, self.MARGIN_V + 0.5, -self.MARGIN_H - 0.5, -self.MARGIN_V - 0.5
+        )
+        painter.setPen(self.BORDER_COLOR)
+        painter.setBrush(self.SENDER_BUBBLE_COLORS.get(index.data(SenderRole), self.BUBBLE_COLOR))
+        painter.drawRoundedRect(bubble, 12, 12)
+
+        left = option.rect.left() + self.MARGIN_H + self.PADDING
+        top = option.rect.top() + self.MARGIN_V + self.PADDING
+        painter.setFont(sender_font)
+        painter.setPen(self.SENDER_COLOR)
+        painter.drawStaticText(QPointF(left, top), sender)
+        painter.setFont(option.font)
+        painter.setPen(self.TEXT_COLOR)
+        sender_height = self._text_height(index.data(SenderRole), sender_font, width)
+        painter.drawStaticText(QPointF(left, top + sender_height + self.SPACING), body)
+        painter.restore()
+
+    def sizeHint(self, option: QStyleOptionViewItem, index: QModelIndex) -> QSize:
+        width = self._content_width(option)
+        height = (self._text_height(index.data(SenderRole), self._sender_font(option.font), width)
+                  + self.SPACING + self._text_height(index.data(), option.font, width)
+                  + 2 * (self.PADDING + self.MARGIN_V))
+        return QSize(width + 2 * (self.MARGIN_H + self.PADDING), int(height) + 1)
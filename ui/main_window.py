@@ -5,42 +5,221 @@ Follows Material Design principles and supports RTL layouts for Persian text.
 
 import sys
 import os
-from typing import Optional, Dict, List
+import json
+import threading
+import subprocess
+import concurrent.futures
+from typing import Optional, Dict, List, Set, Tuple
 from PySide6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout,
     QTextEdit, QPushButton, QLabel, QProgressBar,
-    QScrollArea, QFrame, QHBoxLayout, QSizePolicy, 
-    QComboBox, QStackedWidget
+    QFrame, QHBoxLayout, QComboBox, QListView, QAbstractItemView, QStackedWidget,
+    QScroller, QScrollerProperties
 )
-from PySide6.QtCore import Qt, Slot, QThread, Signal, QSize, QTimer
-from PySide6.QtGui import QFont, QFontDatabase, QIcon, QTextCursor, Qt as QtGui
+from PySide6.QtCore import (
+    Qt, Slot, QObject, QRunnable, QThread, QThreadPool, Signal, QTimer, QStringListModel, QSignalBlocker
+)
+from PySide6.QtGui import QFont, QFontDatabase, QTextCursor
 from . import styles
+from .chat_view import ChatModel, ChatDelegate
+from utils import event_loop
 import asyncio
-class WorkerThread(QThread):
-    """Class for managing async operations"""
+
+# Command launching CLI mode (see run_cli)
+_CLI_COMMAND = [sys.executable, "-m", "agent.cli"]
+
+# Packages the CLI subprocess imports (see run_cli)
+_CLI_PACKAGES = [
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), name)
+    for name in ("agent", "utils")
+]
+
+# Bundled Persian font, loaded after the window is first shown
+_FONT_PATH = os.path.join(os.path.dirname(__file__), "fonts", "Vazir.ttf")
+
+_WELCOME_TEXT = (
+    "سلام! 👋\n"
+    "من دستیار هوشمند شما هستم و می‌توانم در موارد مختلف به شما کمک کنم.\n\n"
+    "می‌توانید از من بپرسید:\n"
+    "• جستجو و مقایسه قیمت محصولات\n"
+    "• تحلیل و بررسی محصولات\n"
+    "• پیشنهاد محصولات مشابه\n"
+    "• راهنمایی برای خرید\n"
+    "• مدیریت سیستم و برنامه‌ها\n\n"
+    "هر سؤالی دارید، با خیال راحت بپرسید! 😊"
+)
+
+# Scrolls to the newest message are coalesced to one per frame (~60 Hz)
+SCROLL_FLUSH_INTERVAL = 16
+
+# Result keys shown by _on_worker_finished, in priority order, with the
+# sender shown for each
+_RESULT_KEYS = (
+    ("error", "خطا"),
+    ("response", "سیستم"),
+    ("analysis", "تحلیل"),
+    ("recommendations", "پیشنهادات"),
+)
+
+# Seconds to wait for clients to close their connections when the window closes
+CLIENT_CLOSE_TIMEOUT = 2.0
+
+try:
+    import qasync
+except ImportError:
+    qasync = None
+
+
+def _qt_event_loop() -> Optional[asyncio.AbstractEventLoop]:
+    """The qasync loop installed by the launcher, if any"""
+    if qasync is None:
+        return None
+    try:
+        loop = asyncio.get_event_loop()
+    except RuntimeError:
+        return None
+    return loop if isinstance(loop, qasync.QEventLoop) else None
+
+def _precompile_cli() -> None:
+    """Write missing/stale .pyc files for the CLI's packages"""
+    import compileall
+    for path in _CLI_PACKAGES:
+        try:
+            compileall.compile_dir(path, quiet=2)
+        except Exception:
+            pass
+
+# Fallback fonts with good Persian support, in order of preference
+_FALLBACK_FAMILIES = ["Tahoma", "Arial", "Segoe UI"]
+
+# Family chosen by the last launch, reused while Vazir.ttf is unchanged
+_FONT_CACHE_PATH = os.path.join(os.path.dirname(__file__), ".font_cache.json")
+
+# Application font family, chosen (and Vazir.ttf registered) on first use
+_font_family: Optional[str] = None
+_font_lock = threading.Lock()
+
+def _font_mtime() -> Optional[float]:
+    try:
+        return os.stat(_FONT_PATH).st_mtime
+    except OSError:
+        return None
+
+def _cached_font_family() -> Optional[str]:
+    """The family recorded in the font cache, if it is still valid"""
+    try:
+        with open(_FONT_CACHE_PATH, encoding="utf-8") as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if (not isinstance(cache, dict) or cache.get("path") != _FONT_PATH
+            or cache.get("mtime") != _font_mtime()):
+        return None
+    family = cache.get("family")
+    return family if isinstance(family, str) else None
+
+def _save_font_family(family: str) -> None:
+    tmp = _FONT_CACHE_PATH + ".tmp"
+    try:
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"path": _FONT_PATH, "mtime": _font_mtime(), "family": family}, f)
+        os.replace(tmp, _FONT_CACHE_PATH)
+    except OSError:
+        pass
+
+def _app_font_family() -> Optional[str]:
+    """The family for the application font, loading Vazir.ttf at most once
+
+    Safe to call from a pool thread (QFontDatabase is thread-safe).
+    """
+    global _font_family
+    with _font_lock:
+        if _font_family is None:
+            cached = _cached_font_family()
+            if cached is not None and cached != "Vazir":
+                # Vazir.ttf is missing or unusable; skip probing the system fonts
+                _font_family = cached
+            else:
+                font_id = QFontDatabase.addApplicationFont(_FONT_PATH) if os.path.exists(_FONT_PATH) else -1
+                if font_id >= 0:
+                    _font_family = "Vazir"
+                else:
+                    installed = set(QFontDatabase.families())
+                    _font_family = next((f for f in _FALLBACK_FAMILIES if f in installed), "")
+                if cached != _font_family:
+                    _save_font_family(_font_family)
+        return _font_family or None
+
+class FontSignals(QObject):
+    """Signals for the font loader run on the thread pool"""
+    loaded = Signal(str)
+
+class WorkerSignals(QObject):
+    """Signals for agent requests run on the AgentLoop thread"""
     finished = Signal(dict)
-    progress = Signal(str)
 
-    def __init__(self, agent) -> None:
+class AgentLoop(QThread):
+    """Long-lived thread running the asyncio loop agent requests are awaited on
+
+    One loop serves every request, so the client's connection pool and
+    other per-loop resources are reused from one message to the next.
+    """
+
+    def __init__(self, parent=None) -> None:
+        super().__init__(parent)
+        self.loop = event_loop.new_event_loop()
+
+    def run(self) -> None:
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+
+    def submit(self, coro) -> concurrent.futures.Future:
+        """Schedule coro on the loop (from any thread)"""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def stop(self) -> None:
+        """Stop the loop and wait for the thread to finish"""
+        if self.isRunning():
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self.wait()
+
+async def _run_request(agent, command: str, signals: WorkerSignals) -> None:
+    """Await one agent request and emit its result (run on the AgentLoop)"""
+    try:
+        result = await agent.process_request(command)
+    except Exception as e:
+        result = {"type": "error", "error": str(e)}
+    signals.finished.emit(result)
+
+async def _close_clients(clients) -> None:
+    """Close the HTTP connections of clients that hold any (run on the AgentLoop)"""
+    await asyncio.gather(
+        *(client.aclose() for client in clients if hasattr(client, "aclose")),
+        return_exceptions=True,
+    )
+
+class ClientSignals(QObject):
+    """Signals for ClientRunnable"""
+    created = Signal(object, int)
+
+class ClientRunnable(QRunnable):
+    """Creates an AI client on the global thread pool"""
+
+    def __init__(self, agent_factory, provider, model: str, generation: int,
+                 signals: ClientSignals) -> None:
         super().__init__()
-        self.agent = agent
-        self.command: Optional[str] = None
-        self._result = None
+        self.agent_factory = agent_factory
+        self.provider = provider
+        self.model = model
+        self.generation = generation
+        self.signals = signals
 
     def run(self) -> None:
         try:
-            if self.command is None:
-                self.progress.emit("There are no commands to execute.")
-                return
-            # agent.process_request is async; run it in this thread's context
-            try:
-                result = asyncio.run(self.agent.process_request(self.command))
-            except Exception as e:
-                result = {"type": "error", "error": str(e)}
-            self.finished.emit(result)
-        except Exception as e:
-            self.progress.emit(f"error: {str(e)}")
-            self.progress.emit(f"error: {str(e)}")
+            client = self.agent_factory.create_client(provider=self.provider, model=self.model)
+        except Exception:
+            client = None
+        self.signals.created.emit(client, self.generation)
 
 class MainWindow(QMainWindow):
     """Main application window implementing a modern chat interface with RTL support."""
@@ -50,13 +229,50 @@ class MainWindow(QMainWindow):
         
         # Initialize core components
         self.agent_factory = agent_factory
-        self.agent = self.agent_factory.create_client()
-        self.messages: List[Dict] = []
-        self.worker = None
+        # Created by _late_init, after the window's first paint
+        self.agent = None
+        # Messages shown since the last flush, inserted together next event loop pass
+        self._pending_messages: List[Tuple[str, str]] = []
+        # Requests to show the newest message wait for one single-shot tick
+        self._scroll_pending = False
+        self._scroll_timer = QTimer(self)
+        self._scroll_timer.setSingleShot(True)
+        self._scroll_timer.setInterval(SCROLL_FLUSH_INTERVAL)
+        self._scroll_timer.timeout.connect(self._flush_scroll)
+        # Requests run on a long-lived loop thread (started on first use);
+        # results come back through these signals (queued to the GUI
+        # thread), connected once here
+        self.worker_signals = WorkerSignals(self)
+        self.worker_signals.finished.connect(self._on_worker_finished, Qt.ConnectionType.QueuedConnection)
+        self._agent_loop: Optional[AgentLoop] = None
+        # With a shared Qt/asyncio loop, requests are awaited on the GUI
+        # thread instead; running tasks are referenced here until done
+        self._loop = _qt_event_loop()
+        self._tasks: Set[asyncio.Task] = set()
+        # Clients for a provider change are created off the GUI thread; only
+        # the one for the latest change (generation) is kept
+        self.client_signals = ClientSignals(self)
+        self.client_signals.created.connect(self._on_client_created, Qt.ConnectionType.QueuedConnection)
+        self._client_generation = 0
+        # (provider, model) of the client in use or being created
+        self._client_key: Optional[Tuple[str, str]] = None
+        # Model names per provider, built the first time it is selected
+        self._model_lists: Dict[str, QStringListModel] = {}
         self.setup_window()
-        self.setup_font()
         self.init_ui()
+        # Fonts, the AI client and the welcome message are not needed for the
+        # first paint; set them up on the first event loop pass
+        QTimer.singleShot(0, self._late_init)
+        
+    def _late_init(self):
+        """Finish start-up work deferred from __init__"""
+        self.setup_font()
+        if self.agent is None:
+            self.agent = self.agent_factory.create_client()
         self.show_welcome_message()
+        # Byte-compile what the CLI imports while idle, so launching it
+        # doesn't pay for compiling modules the GUI never imported
+        QThreadPool.globalInstance().start(_precompile_cli)
         
     def setup_window(self):
         """Configure main window properties"""
@@ -64,27 +280,30 @@ class MainWindow(QMainWindow):
         self.setMinimumWidth(800)  # More responsive minimum size
         self.setMinimumHeight(600)
         self.setLayoutDirection(Qt.LayoutDirection.RightToLeft)  # RTL support
+        # Set on the application once, rather than parsed again per window
+        app = QApplication.instance()
+        if app.styleSheet() != styles.STYLE:
+            app.setStyleSheet(styles.STYLE)
         
     def setup_font(self):
         """Initialize and configure fonts with proper fallbacks"""
+        if _font_family is not None or _cached_font_family() is not None:
+            # Already resolved (now or by an earlier launch): cheap to apply
+            self._apply_font(_app_font_family() or "")
+            return
+        # First launch: find the family on the pool, keep the default font meanwhile
+        signals = FontSignals(self)
+        signals.loaded.connect(self._apply_font, Qt.ConnectionType.QueuedConnection)
+        QThreadPool.globalInstance().start(lambda: signals.loaded.emit(_app_font_family() or ""))
+
+    def _apply_font(self, family: str):
+        """Make family (Vazir or the first installed fallback) the application font"""
         font = QFont()
         font.setPointSize(11)
-        
-        # Try loading Vazir font
-        font_path = os.path.join(os.path.dirname(__file__), "fonts", "Vazir.ttf")
-        if os.path.exists(font_path):
-            font_id = QFontDatabase.addApplicationFont(font_path)
-            if font_id >= 0:
-                font.setFamily("Vazir")
-        else:
-            # Fallback fonts with good Persian support
-            for family in ["Tahoma", "Arial", "Segoe UI"]:
-                font.setFamily(family)
-                if font.exactMatch():
-                    break
+        if family:
+            font.setFamily(family)
                     
         QApplication.setFont(font)
-        self.setStyleSheet(styles.STYLE)
         
     def init_ui(self):
         """Initialize and setup the user interface"""
@@ -111,29 +330,47 @@ class MainWindow(QMainWindow):
         
         # AI Provider selection with status
         provider_label = QLabel("سرویس هوش مصنوعی:")
+        provider_label.setTextFormat(Qt.TextFormat.PlainText)
         self.provider_combo = QComboBox()
         
         # Get available providers from factory
         providers = self.agent_factory.get_available_providers()
-        for display_name, provider_id in providers:
-            self.provider_combo.addItem(display_name, provider_id)
-            
-        self.provider_combo.currentIndexChanged.connect(self.on_provider_changed)
+        with QSignalBlocker(self.provider_combo):
+            for display_name, provider_id in providers:
+                self.provider_combo.addItem(display_name, provider_id)
         
         # Model selection with tooltip
         model_label = QLabel("نوع مدل:")
+        model_label.setTextFormat(Qt.TextFormat.PlainText)
         self.model_combo = QComboBox()
         self.model_combo.setToolTip("مدل‌های در دسترس بر اساس کلید API انتخاب می‌شوند")
         # Note: do not update the model list here because api_status
         # widget is created below. Update models after api_status exists.
         
-        # API Status indicator
-        self.api_status = QLabel()
+        # API Status indicator: one pre-styled label per state, so a status
+        # change only switches pages instead of re-polishing a label
+        self.api_status = QStackedWidget()
         self.api_status.setObjectName("apiStatus")
-        self.update_api_status()
+        self._api_status_pages: Dict[str, int] = {}
+        for status, name, text in (
+            ("loading", "apiStatusLoading", "در حال بررسی..."),
+            ("available", "apiStatusAvailable", "✓ متصل"),
+            ("unavailable", "apiStatusUnavailable", "⚠️ کلید API یافت نشد"),
+        ):
+            label = QLabel(text)
+            label.setObjectName(name)
+            # Plain text labels skip Qt's rich-text detection
+            label.setTextFormat(Qt.TextFormat.PlainText)
+            self._api_status_pages[status] = self.api_status.addWidget(label)
 
-        # Now that api_status exists, populate the model list
+        # Now that api_status exists, populate the model list (this also
+        # updates the API status)
         self.update_model_list()
+
+        # Connect only once both combos are populated; the initial client is
+        # created by _late_init
+        self.provider_combo.currentIndexChanged.connect(self.on_provider_changed)
+        self.model_combo.currentIndexChanged.connect(self.on_model_changed)
         
         # CLI Button (right-aligned)
         self.cli_button = QPushButton("اجرا در خط فرمان")
@@ -153,23 +390,36 @@ class MainWindow(QMainWindow):
         
     def create_chat_area(self) -> QWidget:
         """Create the scrollable chat area"""
-        # Scroll area setup
-        scroll = QScrollArea()
-        scroll.setObjectName("chatScroll")
-        scroll.setWidgetResizable(True)
-        scroll.setFrameShape(QFrame.Shape.NoFrame)
-        scroll.setVerticalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAsNeeded)
-        scroll.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
-        
-        # Chat container
-        container = QWidget()
-        self.chat_layout = QVBoxLayout(container)
-        self.chat_layout.setAlignment(Qt.AlignmentFlag.AlignTop)
-        self.chat_layout.setSpacing(8)
-        self.chat_layout.setContentsMargins(0, 8, 0, 8)
-        
-        scroll.setWidget(container)
-        return scroll
+        # The list view scrolls by itself and only lays out visible messages
+        # Messages trimmed from memory go to CHAT_HISTORY_LOG (JSON lines), if set
+        self.chat_model = ChatModel(self, history_log=os.getenv("CHAT_HISTORY_LOG") or None)
+        self.chat_view = QListView()
+        self.chat_view.setObjectName("chatView")
+        self.chat_view.setModel(self.chat_model)
+        self.chat_delegate = ChatDelegate(self.chat_view)
+        self.chat_view.setItemDelegate(self.chat_delegate)
+        self.chat_view.setFrameShape(QFrame.Shape.NoFrame)
+        self.chat_view.setVerticalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAsNeeded)
+        self.chat_view.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+        self.chat_view.setSelectionMode(QAbstractItemView.SelectionMode.NoSelection)
+        self.chat_view.setFocusPolicy(Qt.FocusPolicy.NoFocus)
+        # Re-measure rows (text wrapping) when the view is resized
+        self.chat_view.setResizeMode(QListView.ResizeMode.Adjust)
+        # Lay rows out in batches between events rather than all at once
+        self.chat_view.setLayoutMode(QListView.LayoutMode.Batched)
+        self.chat_view.setBatchSize(50)
+        self.chat_view.setContentsMargins(0, 4, 0, 4)
+        # Scroll by pixels (rows are tall bubbles) with kinetic dragging
+        self.chat_view.setVerticalScrollMode(QAbstractItemView.ScrollMode.ScrollPerPixel)
+        self._scroll_bar = self.chat_view.verticalScrollBar()
+        self._scroll_bar.setSingleStep(20)
+        viewport = self.chat_view.viewport()
+        QScroller.grabGesture(viewport, QScroller.ScrollerGestureType.LeftMouseButtonGesture)
+        scroller = QScroller.scroller(viewport)
+        props = scroller.scrollerProperties()
+        props.setScrollMetric(QScrollerProperties.ScrollMetric.DecelerationFactor, 0.35)
+        scroller.setScrollerProperties(props)
+        return self.chat_view
         
     def create_input_panel(self) -> QWidget:
         """Create the bottom input panel"""
@@ -211,19 +461,11 @@ class MainWindow(QMainWindow):
         self.status_bar.setMaximumHeight(2)
         return self.status_bar
 
-        
-
     def update_api_status(self):
         """Update the API status indicator based on available keys"""
         provider = self.provider_combo.currentData()
         
-        # Set initial loading state
-        self.api_status.setText("در حال بررسی...")
-        self.api_status.setProperty("status", "loading")
-        self.api_status.style().unpolish(self.api_status)
-        self.api_status.style().polish(self.api_status)
-        
-        # Check API key status
+        # Check API key status (environment lookups only, so no loading state)
         has_key = False
         if provider == "gemini":
             has_key = bool(os.getenv('GOOGLE_API_KEY'))
@@ -232,30 +474,26 @@ class MainWindow(QMainWindow):
         else:
             has_key = True  # Mock client always available
             
-        # Update status after a small delay to show loading state
-        QTimer.singleShot(500, lambda: self._update_api_status_ui(has_key))
+        self._update_api_status_ui(has_key)
         
     def _update_api_status_ui(self, has_key: bool):
         """Update API status UI elements"""
-        if has_key:
-            self.api_status.setText("✓ متصل")
-            self.api_status.setProperty("status", "available")
-        else:
-            self.api_status.setText("⚠️ کلید API یافت نشد")
-            self.api_status.setProperty("status", "unavailable")
-        
-        # Force style refresh
-        self.api_status.style().unpolish(self.api_status)
-        self.api_status.style().polish(self.api_status)
+        status = "available" if has_key else "unavailable"
+        self.api_status.setCurrentIndex(self._api_status_pages[status])
         
     def update_model_list(self):
         """Update available models based on selected provider"""
         provider = self.provider_combo.currentData()
-        self.model_combo.clear()
-        
-        # Get models from factory
-        models = self.agent_factory.get_models(provider)
-        self.model_combo.addItems(models)
+        model_list = self._model_lists.get(provider)
+        if model_list is None:
+            # Get models from factory
+            models = self.agent_factory.get_models(provider)
+            # Parented to the window, so the combo keeps it when switching away
+            model_list = QStringListModel(list(models), self)
+            self._model_lists[provider] = model_list
+        # Switch without emitting currentIndexChanged; the caller handles it
+        with QSignalBlocker(self.model_combo):
+            self.model_combo.setModel(model_list)
         
         # Update API status
         self.update_api_status()
@@ -263,57 +501,64 @@ class MainWindow(QMainWindow):
     def on_provider_changed(self):
         """Handle AI provider change"""
         self.update_model_list()
-        provider = self.provider_combo.currentData()
-        self.agent = self.agent_factory.create_client(
-            provider=provider,
-            model=self.model_combo.currentText()
-        )
+        self.on_model_changed()
+
+    def on_model_changed(self):
+        """Switch to a client for the selected provider and model"""
+        key = (self.provider_combo.currentData(), self.model_combo.currentText())
+        if key == self._client_key:
+            return
+        self._client_key = key
+        # Client setup (SDK import, configuration) runs on a pooled thread;
+        # the current client stays in use until the new one is ready
+        self._client_generation += 1
+        QThreadPool.globalInstance().start(ClientRunnable(
+            self.agent_factory, key[0], key[1],
+            self._client_generation, self.client_signals
+        ))
+        
+    def _on_client_created(self, client, generation: int):
+        """Switch to a client created for a provider or model change"""
+        if generation != self._client_generation:
+            return
+        if client is None or not self.agent_factory.is_cached(*self._client_key):
+            # Creation failed, or the factory fell back to the mock client:
+            # let selecting the same provider and model again retry
+            self._client_key = None
+            if client is None:
+                return
+        self.agent = client
         
     def run_cli(self):
         """Launch CLI mode in a separate process"""
-        import subprocess
-        subprocess.Popen([sys.executable, "-m", "agent.cli"])
+        # Process creation can take tens of ms; keep it off the GUI thread
+        QThreadPool.globalInstance().start(lambda: subprocess.Popen(_CLI_COMMAND))
         
     def show_message(self, sender: str, message: str):
         """Add a new message to the chat area with proper styling"""
-        # Store in history
-        self.messages.append({"sender": sender, "message": message})
-        
-        # Create message container with proper styling
-        msg_container = QWidget()
-        msg_container.setObjectName("messageContainer")
-        msg_container.setProperty("sender", sender.lower())  # For CSS styling
-        
-        msg_layout = QVBoxLayout(msg_container)
-        msg_layout.setContentsMargins(12, 12, 12, 12)
-        msg_layout.setSpacing(4)
-        
-        # Sender label with proper RTL support
-        sender_label = QLabel(sender)
-        sender_label.setObjectName("messageSender")
-        sender_label.setAlignment(Qt.AlignmentFlag.AlignRight)
-        msg_layout.addWidget(sender_label)
-        
-        # Message content with proper text wrapping
-        msg_content = QLabel(message)
-        msg_content.setObjectName("messageContent")
-        msg_content.setWordWrap(True)
-        msg_content.setTextFormat(Qt.TextFormat.PlainText)
-        msg_content.setAlignment(Qt.AlignmentFlag.AlignRight)
-        msg_layout.addWidget(msg_content)
-        
-        # Add to chat and ensure visibility
-        self.chat_layout.addWidget(msg_container)
-        self.ensure_message_visible(msg_container)
-        
-    def ensure_message_visible(self, widget: QWidget):
-        """Ensure the newest message is visible"""
-        scroll_area = self.findChild(QScrollArea, "chatScroll")
-        if scroll_area:
-            scroll_bar = scroll_area.verticalScrollBar()
-            scroll_bar.setValue(scroll_bar.maximum())
-        widget.show()
-        QApplication.processEvents()
+        # Messages shown in one burst are inserted (and laid out) together;
+        # they reach the history (self.chat_model) when the batch is flushed
+        if not self._pending_messages:
+            QTimer.singleShot(0, self._flush_messages)
+        self._pending_messages.append((sender, message))
+        
+    def _flush_messages(self):
+        """Insert the pending messages into the chat in one batch"""
+        pending, self._pending_messages = self._pending_messages, []
+        self.chat_model.append_messages(pending)
+        self.ensure_message_visible()
+        
+    def ensure_message_visible(self):
+        """Ensure the newest message is visible (on the next scroll tick)"""
+        if not self._scroll_pending:
+            self._scroll_pending = True
+            self._scroll_timer.start()
+
+    def _flush_scroll(self):
+        """Scroll to the newest message once for all requests since the last tick"""
+        self._scroll_pending = False
+        self._scroll_bar.setValue(self._scroll_bar.maximum())
+        self.chat_view.viewport().update()
         
     def show_error(self, message: str):
         """Display error message in chat"""
@@ -325,18 +570,7 @@ class MainWindow(QMainWindow):
         
     def show_welcome_message(self):
         """Display initial welcome message"""
-        welcome_text = (
-            "سلام! 👋\n"
-            "من دستیار هوشمند شما هستم و می‌توانم در موارد مختلف به شما کمک کنم.\n\n"
-            "می‌توانید از من بپرسید:\n"
-            "• جستجو و مقایسه قیمت محصولات\n"
-            "• تحلیل و بررسی محصولات\n"
-            "• پیشنهاد محصولات مشابه\n"
-            "• راهنمایی برای خرید\n"
-            "• مدیریت سیستم و برنامه‌ها\n\n"
-            "هر سؤالی دارید، با خیال راحت بپرسید! 😊"
-        )
-        self.show_message("سیستم", welcome_text)
+        self.show_message("سیستم", _WELCOME_TEXT)
         
     def set_input_enabled(self, enabled: bool):
         """Enable/disable input controls"""
@@ -357,12 +591,38 @@ class MainWindow(QMainWindow):
         
         # Disable input during processing
         self.set_input_enabled(False)
-        # Create a worker thread to run the agent call (runs asyncio in thread)
-        self.worker = WorkerThread(self.agent)
-        self.worker.command = user_input
-        self.worker.finished.connect(self._on_worker_finished)
-        self.worker.progress.connect(self._on_worker_progress)
-        self.worker.start()
+        # Repeated prompts are answered from the client's own caches
+        if self._loop is not None:
+            task = self._loop.create_task(self._process_request(user_input))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+            return
+        # Await the agent call on the loop thread
+        if self._agent_loop is None:
+            self._agent_loop = AgentLoop(self)
+            self._agent_loop.start()
+        self._agent_loop.submit(_run_request(self.agent, user_input, self.worker_signals))
+
+    def closeEvent(self, event):
+        """Stop the agent loop thread before the window goes away"""
+        if self._agent_loop is not None:
+            # Clients are shared by (provider, model) and their connection
+            # pools belong to this loop; close them before it stops
+            future = self._agent_loop.submit(_close_clients(self.agent_factory.cached_clients()))
+            try:
+                future.result(timeout=CLIENT_CLOSE_TIMEOUT)
+            except Exception:
+                pass
+            self._agent_loop.stop()
+        super().closeEvent(event)
+
+    async def _process_request(self, command: str):
+        """Await the agent on the shared event loop and show its result"""
+        try:
+            result = await self.agent.process_request(command)
+        except Exception as e:
+            result = {"type": "error", "error": str(e)}
+        self._on_worker_finished(result)
 
     @Slot(dict)
     def on_result(self, result: dict):
@@ -376,33 +636,26 @@ class MainWindow(QMainWindow):
         """نمایش پیشرفت عملیات"""
         self.show_message("سیستم", message)
 
-    def _on_worker_progress(self, message: str):
-        # Show progress messages in the UI
-        self.show_system_message(message)
-
     def _on_worker_finished(self, result: dict):
         # Handle worker result and re-enable inputs
         try:
             if isinstance(result, dict):
-                if result.get('error'):
-                    self.show_error(str(result['error']))
-                elif result.get('response'):
-                    self.show_message('سیستم', str(result['response']))
-                elif result.get('analysis'):
-                    self.show_message('تحلیل', str(result['analysis']))
-                elif result.get('recommendations'):
-                    recommendations = result.get('recommendations', [])
-                    if isinstance(recommendations, list):
-                        self.show_message('پیشنهادات', '\n'.join(map(str, recommendations)))
-                    else:
-                        self.show_message('پیشنهادات', str(recommendations))
-                elif result.get('type') == 'product_search' and result.get('search_params'):
-                    # For product search, delegate to executor via planner or executor
-                    search_params = result.get('search_params', {})
-                    self.show_message('سیستم', str(search_params.get('response', ''))) 
+                for name, sender in _RESULT_KEYS:
+                    value = result.get(name)
+                    if value:
+                        if isinstance(value, list):
+                            self.show_message(sender, '\n'.join(f"• {item}" for item in value))
+                        else:
+                            self.show_message(sender, str(value))
+                        break
                 else:
-                    # Fallback: show the whole result
-                    self.show_message('سیستم', str(result))
+                    search_params = result.get('search_params')
+                    if result.get('type') == 'product_search' and search_params:
+                        # For product search, delegate to executor via planner or executor
+                        self.show_message('سیستم', str(search_params.get('response', '')))
+                    else:
+                        # Fallback: show the whole result
+                        self.show_message('سیستم', str(result))
             else:
                 self.show_message('سیستم', str(result))
         finally:
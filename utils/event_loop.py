@@ -0,0 +1,30 @@
+# utils/event_loop.py
+"""Shared asyncio runner for the console entry points.
+
+Uses uvloop's libuv-based event loop when it is installed (it is not
+available on Windows) and the standard loop otherwise. On Python 3.12+
+tasks are created eagerly: a task whose coroutine finishes without
+suspending (e.g. a cache hit) completes inside create_task instead of
+being scheduled on the loop.
+"""
+import asyncio
+from typing import Any, Coroutine
+
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
+
+def new_event_loop() -> asyncio.AbstractEventLoop:
+    """Create an event loop (uvloop if available) with eager task creation."""
+    loop = uvloop.new_event_loop() if uvloop is not None else asyncio.new_event_loop()
+    if hasattr(asyncio, "eager_task_factory"):
+        loop.set_task_factory(asyncio.eager_task_factory)
+    return loop
+
+
+def run(coro: Coroutine[Any, Any, Any]) -> Any:
+    """Run coro to completion on a fresh event loop (like asyncio.run)."""
+    with asyncio.Runner(loop_factory=new_event_loop) as runner:
+        return runner.run(coro)